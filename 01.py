@@ -68,14 +68,19 @@
 #
 # How many measurements are larger than the previous measurement?
 
-from common import lmap
+from common import ints, mapped
 
-input = lmap(int, open("01.in").read().split())
+def parse(text):
+    return list(ints(text))
+
+def load(filename):
+    return parse(mapped(filename))
 
 def num_increases(list):
     return sum(list[i] > list[i-1] for i in range(1, len(list)))
 
-print(num_increases(input))
+def part1(input):
+    return num_increases(input)
 
 # --- Part Two ---
 #
@@ -127,8 +132,12 @@ print(num_increases(input))
 # Consider sums of a three-measurement sliding window.  How many sums
 # are larger than the previous sum?
 
-print(
-    num_increases(
+def part2(input):
+    return num_increases(
         [input[i-2]+input[i-1]+input[i] for i in range(2, len(input))]
     )
-)
+
+if __name__ == "__main__":
+    input = load("01.in")
+    print(part1(input))
+    print(part2(input))
@@ -42,17 +42,24 @@
 # following the planned course.  What do you get if you multiply your
 # final horizontal position by your final depth?
 
-x = depth = 0
-for l in open("02.in"):
-    dir, n = l.split()
-    n = int(n)
-    if dir == "forward":
-        x += n
-    elif dir == "up":
-        depth -= n
-    elif dir == "down":
-        depth += n
-print(x*depth)
+from common import fields, mapped
+
+def parse(text):
+    return [(dir, int(n)) for dir, n in fields(text)]
+
+def load(filename):
+    return parse(mapped(filename))
+
+def part1(course):
+    x = depth = 0
+    for dir, n in course:
+        if dir == "forward":
+            x += n
+        elif dir == "up":
+            depth -= n
+        elif dir == "down":
+            depth += n
+    return x*depth
 
 # --- Part Two ---
 #
@@ -95,15 +102,19 @@ print(x*depth)
 # planned course.  What do you get if you multiply your final
 # horizontal position by your final depth?
 
-x = depth = aim = 0
-for l in open("02.in"):
-    dir, n = l.split()
-    n = int(n)
-    if dir == "forward":
-        x += n
-        depth += aim*n
-    elif dir == "up":
-        aim -= n
-    elif dir == "down":
-        aim += n
-print(x*depth)
+def part2(course):
+    x = depth = aim = 0
+    for dir, n in course:
+        if dir == "forward":
+            x += n
+            depth += aim*n
+        elif dir == "up":
+            aim -= n
+        elif dir == "down":
+            aim += n
+    return x*depth
+
+if __name__ == "__main__":
+    course = load("02.in")
+    print(part1(course))
+    print(part2(course))
@@ -55,14 +55,16 @@
 # the power consumption of the submarine?  (Be sure to represent your
 # answer in decimal, not binary.)
 
-input = open("03.in").read().split()
+def parse(text):
+    return text.split()
 
-gamma = "".join(
-    "1" if [num[p] for num in input].count("1")/len(input) > 1/2 else "0"
-    for p in range(len(input[0]))
-)
-epsilon = gamma.translate(str.maketrans("01", "10"))
-print(int(gamma, 2) * int(epsilon, 2))
+def part1(input):
+    gamma = "".join(
+        "1" if [num[p] for num in input].count("1")/len(input) > 1/2 else "0"
+        for p in range(len(input[0]))
+    )
+    epsilon = gamma.translate(str.maketrans("01", "10"))
+    return int(gamma, 2) * int(epsilon, 2)
 
 # --- Part Two ---
 #
@@ -153,6 +155,12 @@ def sift(list, pos, criterion, eq_selector):
         i = lens.index(criterion(lens))
     return sift(sublists[i], pos+1, criterion, eq_selector)
 
-oxygen = sift(input, 0, max, 1)
-co2 = sift(input, 0, min, 0)
-print(int(oxygen, 2) * int(co2, 2))
+def part2(input):
+    oxygen = sift(input, 0, max, 1)
+    co2 = sift(input, 0, min, 0)
+    return int(oxygen, 2) * int(co2, 2)
+
+if __name__ == "__main__":
+    input = parse(open("03.in").read())
+    print(part1(input))
+    print(part2(input))
@@ -79,6 +79,8 @@
 # will win first.  What will your final score be if you choose that
 # board?
 
+from common import each_do
+
 BS = 5  # board size
 
 class Board:
@@ -91,10 +93,10 @@ class Board:
                 assert n not in self.nums
                 self.nums[n] = (r, c)
         self.clear()
-        self.won = False
 
     def clear(self):
         self.marked = [[False]*BS for _ in range(BS)]
+        self.won = False
 
     def mark(self, num):
         if not self.won and num in self.nums:
@@ -111,20 +113,21 @@ class Board:
                 )
         return None
 
-lines = open("04.in").readlines()
-nums = [int(n) for n in lines[0].split(",")]
-boards = [Board(lines[i+1:i+BS+1]) for i in range(1, len(lines), BS+1)]
+def parse(text):
+    lines = text.splitlines()
+    nums = [int(n) for n in lines[0].split(",")]
+    boards = [Board(lines[i+1:i+BS+1]) for i in range(1, len(lines), BS+1)]
+    return nums, boards
 
-score = None
-for n in nums:
-    for b in boards:
-        result = b.mark(n)
-        if result != None:
-            score = n*result
-            break
-    if score != None:
-        break
-print(score)
+def part1(game):
+    nums, boards = game
+    each_do(Board.clear, boards)
+    for n in nums:
+        for b in boards:
+            result = b.mark(n)
+            if result != None:
+                return n*result
+    return None
 
 # --- Part Two ---
 #
@@ -145,14 +148,18 @@ print(score)
 # Figure out which board will win last.  Once it wins, what would its
 # final score be?
 
-from common import each_do
-
-each_do(Board.clear, boards)
+def part2(game):
+    nums, boards = game
+    each_do(Board.clear, boards)
+    score = None
+    for n in nums:
+        for b in boards:
+            result = b.mark(n)
+            if result != None:
+                score = n*result
+    return score
 
-score = None
-for n in nums:
-    for b in boards:
-        result = b.mark(n)
-        if result != None:
-            score = n*result
-print(score)
+if __name__ == "__main__":
+    game = parse(open("04.in").read())
+    print(part1(game))
+    print(part2(game))
@@ -58,25 +58,32 @@
 # Consider only horizontal and vertical lines.  At how many points do
 # at least two lines overlap?
 
-from common import cmp, each_do
+from common import cmp, each_do, ints, mapped
 from collections import namedtuple, Counter
-import re
 
 Line = namedtuple("Line", "x1 y1 x2 y2")
 
-lines = [Line(*map(int, re.findall(r"\d+", l))) for l in open("05.in")]
-grid = Counter()
+def parse(text):
+    v = ints(text)
+    return [Line(*coords) for coords in zip(v, v, v, v)]
 
-def add(line):
-    xd = cmp(line.x1, line.x2)  # deltas
-    yd = cmp(line.y1, line.y2)
-    x, y = line.x1, line.y1
-    while x != line.x2+xd or y != line.y2+yd:
-        grid[(x, y)] += 1
-        x, y = x+xd, y+yd
+def load(filename):
+    return parse(mapped(filename))
 
-each_do(add, [l for l in lines if l.x1 == l.x2 or l.y1 == l.y2])
-print(sum(map(lambda c: c > 1, grid.values())))
+def num_overlaps(lines):
+    grid = Counter()
+    def add(line):
+        xd = cmp(line.x1, line.x2)  # deltas
+        yd = cmp(line.y1, line.y2)
+        x, y = line.x1, line.y1
+        while x != line.x2+xd or y != line.y2+yd:
+            grid[(x, y)] += 1
+            x, y = x+xd, y+yd
+    each_do(add, lines)
+    return sum(map(lambda c: c > 1, grid.values()))
+
+def part1(lines):
+    return num_overlaps([l for l in lines if l.x1 == l.x2 or l.y1 == l.y2])
 
 # --- Part Two ---
 #
@@ -112,5 +119,10 @@ print(sum(map(lambda c: c > 1, grid.values())))
 # Consider all of the lines.  At how many points do at least two lines
 # overlap?
 
-each_do(add, [l for l in lines if l.x1 != l.x2 and l.y1 != l.y2])
-print(sum(map(lambda c: c > 1, grid.values())))
+def part2(lines):
+    return num_overlaps(lines)
+
+if __name__ == "__main__":
+    lines = load("05.in")
+    print(part1(lines))
+    print(part2(lines))
@@ -80,20 +80,82 @@
 # Find a way to simulate lanternfish.  How many lanternfish would
 # there be after 80 days?
 
+from bisect import bisect_right, insort
 from collections import Counter
 
-c = Counter(map(int, open("06.in").read().split(",")))
+def parse(text):
+    return Counter(map(int, text.split(",")))
 
-def simulate(n):
+def simulate(c, n):
+    c = c.copy()
     for _ in range(n):
         save = c[0]
         for n in range(8):
             c[n] = c[n+1]
         c[6] += save
         c[8] = save
+    return c
 
-simulate(80)
-print(sum(c.values()))
+# To fast-forward, note that one day of simulation is a linear map of
+# the 9 timer counts, i.e., multiplication by a 9x9 matrix T, so n days
+# is multiplication by T^n.  We compute T^(2^j) by repeated squaring,
+# memoizing the powers across calls, and apply T^n to the counts as
+# the product of the powers corresponding to the 1 bits of n: O(log n)
+# matrix-vector multiplies per query, after at most O(log n) matrix
+# squarings shared by all queries.  Python's ints keep the results
+# exact at any horizon.
+
+T = [[0]*9 for _ in range(9)]  # T[i][j]: fish of timer i per timer j
+for i in range(8):
+    T[i][i+1] = 1
+T[6][0] = T[8][0] = 1
+
+powers = [T]  # powers[j] = T^(2^j)
+
+def mat_mul(a, b):
+    return [
+        [sum(a[i][k]*b[k][j] for k in range(9)) for j in range(9)]
+        for i in range(9)
+    ]
+
+def mat_vec(a, v):
+    return [sum(a[i][k]*v[k] for k in range(9)) for i in range(9)]
+
+def fast_forward(c, n):
+    # Returns the timer counts after n days as a list indexed by
+    # timer.
+    v = [c[k] for k in range(9)]
+    for j in range(n.bit_length()):
+        if j == len(powers):
+            powers.append(mat_mul(powers[-1], powers[-1]))
+        if n >> j & 1:
+            v = mat_vec(powers[j], v)
+    return v
+
+# Many horizons from the same initial state are answered in a single
+# forward pass: sorted by day, each is reached by fast-forwarding from
+# the previous one (or from a nearer checkpoint).  Every state computed
+# is kept as a checkpoint, so later calls with the same initial state
+# start from the nearest earlier checkpoint instead of from day 0.
+
+checkpoints = {}  # {initial counts: ([day, ...], {day: counts})}
+
+def populations(c, horizons):
+    # Returns the numbers of fish after each of a sorted list of
+    # horizons (numbers of days).
+    start = tuple(c[k] for k in range(9))
+    days, counts = checkpoints.setdefault(start, ([0], {0: start}))
+    result = []
+    for n in horizons:
+        if n not in counts:
+            day = days[bisect_right(days, n)-1]  # nearest checkpoint
+            counts[n] = tuple(fast_forward(counts[day], n-day))
+            insort(days, n)
+        result.append(sum(counts[n]))
+    return result
+
+def part1(c):
+    return populations(c, [80])[0]
 
 # --- Part Two ---
 #
@@ -105,5 +167,10 @@ print(sum(c.values()))
 #
 # How many lanternfish would there be after 256 days?
 
-simulate(256-80)
-print(sum(c.values()))
+def part2(c):
+    return populations(c, [256])[0]
+
+if __name__ == "__main__":
+    c = parse(open("06.in").read())
+    print(part1(c))
+    print(part2(c))
@@ -65,10 +65,18 @@
 # alignment position increases or decreases the sum of distances by
 # |m-n|.
 
-input = [int(v) for v in open("07.in").read().split(",")]
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate
 
-median = sorted(input)[len(input)//2]
-print(sum(abs(v-median) for v in input))
+def parse(text):
+    return [int(v) for v in text.split(",")]
+
+def part1(input):
+    if dense(input):
+        return min(cost_curves(input)[1])
+    median = sorted(input)[len(input)//2]
+    return sum(abs(v-median) for v in input)
 
 # --- Part Two ---
 #
@@ -106,12 +114,83 @@ print(sum(abs(v-median) for v in input))
 #
 # The centroid (in 1 dimension, the mean) minimizes the sum of the
 # distances squared, but here we're dealing not with squares, but
-# triangular numbers, so we just compute the answer (which turns out
-# to be the mean after all).
+# triangular numbers.  Still, the cost of position m is
+#
+#     f(m) = sum((v-m)**2 + |v-m|)/2
+#
+# and the derivative of the second term is bounded by N/2 in
+# magnitude, N being the number of crabs, so it shifts the minimum
+# away from the mean by at most 1/2.  So we need only consider the
+# integer positions within 1 of the mean.  With the positions sorted
+# and their prefix sums in hand, each sum can be evaluated in
+# O(log N), so this is O(N log N) regardless of the spread of the
+# positions.
+
+def triangular_cost(positions, prefix, sum_squares, m):
+    # Returns f(m), given the sorted positions, their prefix sums, and
+    # the sum of their squares.
+    n = len(positions)
+    k = bisect_left(positions, m)  # number of crabs left of m
+    linear = (m*k - prefix[k]) + (prefix[n]-prefix[k] - m*(n-k))
+    squares = sum_squares - 2*m*prefix[n] + n*m*m
+    return (squares+linear)//2
+
+# --------------------
+#
+# Alternatively, when the positions are dense (their spread is not
+# much larger than the number of crabs), both cost functions can be
+# tabulated at every candidate position at once from a histogram of
+# the positions.  With k(m) crabs at or left of m having positions
+# summing to s(m), and S and Q the sums of all positions and their
+# squares,
+#
+#     sum(|v-m|) = m*(2*k(m)-N) + S - 2*s(m)
+#     sum((v-m)**2) = Q - 2*m*S + N*m*m
+#
+# and k and s are running sums over the histogram.  This is
+# O(N + spread), avoids sorting entirely, and gives the whole cost
+# curve, not just its minimum.
 
-print(
-    min(
-        sum(abs(v-m)*(abs(v-m)+1)//2 for v in input)
-        for m in range(min(input)+1, max(input))
+def dense(input):
+    return max(input)-min(input) <= 4*len(input)
+
+def cost_curves(input):
+    # Returns (lo, linear, triangular), where linear[i] and
+    # triangular[i] are the part 1 and part 2 costs of aligning at
+    # position lo+i, for every position from the lowest to the highest
+    # crab.
+    counts = Counter(input)
+    lo, hi = min(counts), max(counts)
+    positions = range(lo, hi+1)
+    histogram = [counts[p] for p in positions]
+    n, S = len(input), sum(input)
+    Q = sum(p*p*c for p, c in counts.items())
+    linear = [
+        m*(2*k-n) + S - 2*s
+        for m, k, s in zip(
+            positions,
+            accumulate(histogram),
+            accumulate(map(int.__mul__, positions, histogram))
+        )
+    ]
+    triangular = [
+        (Q - 2*m*S + n*m*m + l)//2 for m, l in zip(positions, linear)
+    ]
+    return lo, linear, triangular
+
+def part2(input):
+    if dense(input):
+        return min(cost_curves(input)[2])
+    positions = sorted(input)
+    prefix = [0] + list(accumulate(positions))
+    sum_squares = sum(v*v for v in positions)
+    mean = prefix[-1]//len(positions)
+    return min(
+        triangular_cost(positions, prefix, sum_squares, m)
+        for m in range(mean-1, mean+3)
     )
-)
+
+if __name__ == "__main__":
+    input = parse(open("07.in").read())
+    print(part1(input))
+    print(part2(input))
@@ -124,12 +124,19 @@
 # delimiter are 4 digits (that form a single number) that use that
 # same encoding.
 
-print(
-    sum(
-        sum(map(lambda p: len(p) in [2, 3, 4, 7], l.split("|")[1].split()))
-        for l in open("08.in")
+from common import pick, lmap
+
+def parse(text):
+    return [
+        [lmap(set, l) for l in map(str.split, line.split("|"))]
+        for line in text.splitlines()
+    ]
+
+def part1(entries):
+    return sum(
+        sum(map(lambda p: len(p) in [2, 3, 4, 7], outputs))
+        for _, outputs in entries
     )
-)
 
 # --- Part Two ---
 #
@@ -205,8 +212,6 @@ print(
 # length 6 for which the pattern for digit 4 is a subset; and so
 # forth.
 
-from common import pick, lmap
-
 def decode(patterns):
     # patterns: list of sets
     def has_len(n):
@@ -226,11 +231,14 @@ def decode(patterns):
     nums[0] = pick(lambda p: p != nums[6] and p != nums[9], all_of_len(6))
     return nums
 
-total = 0
-for patterns, outputs in [
-    [lmap(set, l) for l in map(str.split, line.split("|"))]
-    for line in open("08.in")
-]:
-    mapping = decode(patterns)
-    total += int("".join(str(mapping.index(p)) for p in outputs))
-print(total)
+def part2(entries):
+    total = 0
+    for patterns, outputs in entries:
+        mapping = decode(patterns)
+        total += int("".join(str(mapping.index(p)) for p in outputs))
+    return total
+
+if __name__ == "__main__":
+    entries = parse(open("08.in").read())
+    print(part1(entries))
+    print(part2(entries))
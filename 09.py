@@ -49,19 +49,24 @@
 # Find all of the low points on your heightmap.  What is the sum of
 # the risk levels of all low points on your heightmap?
 
-from common import neighbors4
+from common import DIGITS, Grid, neighbor_table
 
-grid = [[int(v) for v in l.strip()] for l in open("09.in")]
-R, C = len(grid), len(grid[0])  # grid dimensions
+def parse(text):
+    return Grid.parse(text, DIGITS)
 
-lowpoints = [
-    (r, c)
-    for r in range(R)
-    for c in range(C)
-    if all(grid[r][c] < grid[nr][nc] for nr, nc in neighbors4(r, c, R, C))
-]
+def lowpoints(heightmap):
+    # Returns the flat indexes of the low points.
+    heights = heightmap.cells
+    start, index = neighbor_table(heightmap.num_rows, heightmap.num_cols)
+    return [
+        i
+        for i, h in enumerate(heights)
+        if all(h < heights[n] for n in index[start[i]:start[i+1]])
+    ]
 
-print(sum(grid[r][c]+1 for r, c in lowpoints))
+def part1(heightmap):
+    heights = heightmap.cells
+    return sum(heights[i]+1 for i in lowpoints(heightmap))
 
 # --- Part Two ---
 #
@@ -121,22 +126,26 @@ print(sum(grid[r][c]+1 for r, c in lowpoints))
 # reached; that is, there are no local maxima, saddles, etc., to deal
 # with.
 
-from common import bfs
+from collections import Counter
+from common import bfs_labels
 from functools import reduce
 from operator import mul
 
-def flood(node, prev, dist, accum, seen):
-    r, c = node
-    accum[0] += 1
-    return [
-        (nr, nc)
-        for nr, nc in neighbors4(r, c, R, C)
-        if grid[r][c] < grid[nr][nc] < 9
-    ]
+def part2(heightmap):
+    heights = heightmap.cells
+    start, index = neighbor_table(heightmap.num_rows, heightmap.num_cols)
+    def flood(node):
+        h = heights[node]
+        return [
+            n for n in index[start[node]:start[node+1]] if h < heights[n] < 9
+        ]
+    # A single search from all low points at once labels each
+    # location with its basin (-1 for locations in no basin).
+    sizes = Counter(bfs_labels(len(heights), lowpoints(heightmap), flood))
+    del sizes[-1]
+    return reduce(mul, (size for _, size in sizes.most_common(3)))
 
-print(
-    reduce(
-        mul,
-        sorted(bfs(low, flood, accum_start=0) for low in lowpoints)[-3:]
-    )
-)
+if __name__ == "__main__":
+    heightmap = parse(open("09.in").read())
+    print(part1(heightmap))
+    print(part2(heightmap))
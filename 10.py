@@ -100,16 +100,11 @@ def syntax_score(line):
                 return scores[c]
     return 0
 
-total = 0
-incomplete_lines = []
-for line in open("10.in"):
-    line = line.strip()
-    s = syntax_score(line)
-    if s == 0:
-        incomplete_lines.append(line)
-    else:
-        total += s
-print(total)
+def parse(text):
+    return text.splitlines()
+
+def part1(lines):
+    return sum(map(syntax_score, lines))
 
 # --- Part Two ---
 #
@@ -189,5 +184,13 @@ def autocomplete_score(line):
         s = s*5 + scores[stack.pop()]
     return s
 
-a = sorted(map(autocomplete_score, incomplete_lines))
-print(a[len(a)//2])
+def part2(lines):
+    a = sorted(
+        autocomplete_score(line) for line in lines if syntax_score(line) == 0
+    )
+    return a[len(a)//2]
+
+if __name__ == "__main__":
+    lines = parse(open("10.in").read())
+    print(part1(lines))
+    print(part2(lines))
@@ -319,34 +319,34 @@
 # cavern, simulate 100 steps.  How many total flashes are there after
 # 100 steps?
 
-from common import neighbors8, lmap
+from common import DIGITS, Grid, neighbor_table
 
-def load():
-    return [lmap(int, l.strip()) for l in open("11.in")]
+def parse(text):
+    return Grid.parse(text, DIGITS)
 
-grid = load()
-R, C = len(grid), len(grid[0])  # grid dimensions
-
-def step():
-    flashed = set()
+def step(octopuses):
+    levels = octopuses.cells
+    start, index = neighbor_table(octopuses.num_rows, octopuses.num_cols, 8)
+    flashed = bytearray(len(levels))
     todo = []
-    def increment(r, c):
-        grid[r][c] += 1
-        if grid[r][c] > 9:
-            grid[r][c] = 0
-            flashed.add((r, c))
-            todo.append((r, c))
-    for r in range(R):
-        for c in range(C):
-            increment(r, c)
+    def increment(i):
+        levels[i] += 1
+        if levels[i] > 9:
+            levels[i] = 0
+            flashed[i] = 1
+            todo.append(i)
+    for i in range(len(levels)):
+        increment(i)
     while len(todo) > 0:
-        r, c = todo.pop()
-        for nr, nc in neighbors8(r, c, R, C):
-            if (nr, nc) not in flashed:
-                increment(nr, nc)
-    return len(flashed)
+        i = todo.pop()
+        for n in index[start[i]:start[i+1]]:
+            if not flashed[n]:
+                increment(n)
+    return flashed.count(1)
 
-print(sum(step() for _ in range(100)))
+def part1(octopuses):
+    octopuses = octopuses.copy()
+    return sum(step(octopuses) for _ in range(100))
 
 # --- Part Two ---
 #
@@ -399,5 +399,12 @@ print(sum(step() for _ in range(100)))
 
 from itertools import takewhile, count
 
-grid = load()
-print(len(list(takewhile(lambda _: step() < R*C, count()))) + 1)
+def part2(octopuses):
+    octopuses = octopuses.copy()
+    size = len(octopuses.cells)
+    return len(list(takewhile(lambda _: step(octopuses) < size, count()))) + 1
+
+if __name__ == "__main__":
+    octopuses = parse(open("11.in").read())
+    print(part1(octopuses))
+    print(part2(octopuses))
@@ -123,19 +123,21 @@
 
 from collections import defaultdict, Counter
 
-graph = defaultdict(lambda: [])
-for l in open("12.in"):
-    a, b = l.strip().split("-")
-    graph[a].append(b)
-    graph[b].append(a)
+def parse(text):
+    graph = defaultdict(lambda: [])
+    for l in text.splitlines():
+        a, b = l.split("-")
+        graph[a].append(b)
+        graph[b].append(a)
+    return graph
 
-def walk(node, counts, criterion_fn):
+def walk(graph, node, counts, criterion_fn):
     if node == "end":
         return 1
     if node.islower():
         counts[node] += 1
     num_paths = sum(
-        walk(n, counts, criterion_fn)
+        walk(graph, n, counts, criterion_fn)
         for n in graph[node]
         if n.isupper() or criterion_fn(n, counts)
     )
@@ -143,7 +145,10 @@ def walk(node, counts, criterion_fn):
         counts[node] -= 1
     return num_paths
 
-print(walk("start", Counter(), lambda node, counts: counts[node] == 0))
+def part1(graph):
+    return walk(
+        graph, "start", Counter(), lambda node, counts: counts[node] == 0
+    )
 
 # --- Part Two ---
 #
@@ -201,11 +206,16 @@ print(walk("start", Counter(), lambda node, counts: counts[node] == 0))
 # Given these new rules, how many paths through this cave system are
 # there?
 
-print(
-    walk(
+def part2(graph):
+    return walk(
+        graph,
         "start",
         Counter(),
         lambda node, counts: counts[node] == 0
         or (node != "start" and counts.most_common(1)[0][1] == 1)
     )
-)
+
+if __name__ == "__main__":
+    graph = parse(open("12.in").read())
+    print(part1(graph))
+    print(part2(graph))
@@ -143,8 +143,8 @@
 
 import re
 
-def load():
-    p1, p2 = open("13.in").read().split("\n\n")
+def parse(text):
+    p1, p2 = text.split("\n\n")
     dots = {
         (int(x), int(y)) for x, y in [v.split(",") for v in p1.split("\n")]
     }
@@ -156,8 +156,6 @@ def load():
     ]
     return dots, folds
 
-dots, folds = load()
-
 def fold(dots, axis, center):
     new_dots = set()
     if axis == "x":
@@ -168,7 +166,9 @@ def fold(dots, axis, center):
             new_dots.add((x, y if y < center else 2*center-y))
     return new_dots
 
-print(len(fold(dots, *folds[0])))
+def part1(paper):
+    dots, folds = paper
+    return len(fold(dots, *folds[0]))
 
 # --- Part Two ---
 #
@@ -178,10 +178,19 @@ print(len(fold(dots, *folds[0])))
 # What code do you use to activate the infrared thermal imaging camera
 # system?
 
-for axis, center in folds:
-    dots = fold(dots, axis, center)
+def part2(paper):
+    dots, folds = paper
+    for axis, center in folds:
+        dots = fold(dots, axis, center)
+    return "\n".join(
+        "".join(
+            "#" if (x, y) in dots else "."
+            for x in range(max(x for x, y in dots)+1)
+        )
+        for y in range(max(y for x, y in dots)+1)
+    )
 
-for y in range(max(y for x, y in dots)+1):
-    for x in range(max(x for x, y in dots)+1):
-        print("#" if (x, y) in dots else ".", end="")
-    print()
+if __name__ == "__main__":
+    paper = parse(open("13.in").read())
+    print(part1(paper))
+    print(part2(paper))
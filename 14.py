@@ -93,13 +93,15 @@
 
 from collections import Counter
 
-template, p2 = open("14.in").read().split("\n\n")
-rules = {
-    from_: [from_[0]+to, to+from_[1]]
-    for from_, _, to in map(str.split, p2.splitlines())
-}
+def parse(text):
+    template, p2 = text.split("\n\n")
+    rules = {
+        from_: [from_[0]+to, to+from_[1]]
+        for from_, _, to in map(str.split, p2.splitlines())
+    }
+    return template, rules
 
-def step(counter):
+def step(counter, rules):
     c = Counter()
     for p, v in counter.items():
         a, b = rules[p]
@@ -120,14 +122,15 @@ def tally_elements(counter, first_element, last_element):
         c[e] = v//2
     return c
 
-def solve(num_steps):
+def solve(template, rules, num_steps):
     c = Counter(template[i:i+2] for i in range(len(template)-1))
     for _ in range(num_steps):
-        c = step(c)
+        c = step(c, rules)
     a = tally_elements(c, template[0], template[-1]).most_common()
     return a[0][1]-a[-1][1]
 
-print(solve(10))
+def part1(manual):
+    return solve(*manual, 10)
 
 # --- Part Two ---
 #
@@ -144,4 +147,10 @@ print(solve(10))
 # if you take the quantity of the most common element and subtract the
 # quantity of the least common element?
 
-print(solve(40))
+def part2(manual):
+    return solve(*manual, 40)
+
+if __name__ == "__main__":
+    manual = parse(open("14.in").read())
+    print(part1(manual))
+    print(part2(manual))
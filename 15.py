@@ -48,25 +48,58 @@
 # What is the lowest total risk of any path from the top left to the
 # bottom right?
 
-from common import a_star, neighbors4
+from array import array
+from common import DIGITS, Grid
 
-grid = [[int(v) for v in l.strip()] for l in open("15.in")]
-R, C = len(grid), len(grid[0])  # grid dimensions
+def parse(text):
+    return Grid.parse(text, DIGITS)
 
-def risk(r, c):
-    return grid[r][c]
+def lowest_risk(grid):
+    # Returns the lowest total risk of a path from the top left to the
+    # bottom right of a risk map.
+    #
+    # This is Dijkstra's algorithm with a bucket queue (Dial's
+    # algorithm).  Risks are 1-9, so all nodes in the frontier have
+    # path risks within 9 of the lowest; bucket d%10 holds the nodes
+    # whose tentative path risk is d.  Nodes are simply appended to a
+    # bucket when their risk is lowered, and stale entries are skipped
+    # when popped.
+    risks, num_cols = grid.cells, grid.num_cols
+    num_nodes = len(risks)
+    goal = num_nodes-1
+    dist = array("i", [-1])*num_nodes
+    dist[0] = 0
+    buckets = [[] for _ in range(10)]
+    buckets[0].append(0)
+    d = 0
+    pending = 1  # number of entries in all buckets
+    while pending > 0:
+        bucket = buckets[d%10]
+        while len(bucket) > 0:
+            node = bucket.pop()
+            pending -= 1
+            if dist[node] != d:
+                continue
+            if node == goal:
+                return d
+            c = node%num_cols
+            for n in (
+                node-num_cols if node >= num_cols else -1,
+                node+num_cols if node < num_nodes-num_cols else -1,
+                node-1 if c > 0 else -1,
+                node+1 if c < num_cols-1 else -1
+            ):
+                if n >= 0:
+                    nd = d + risks[n]
+                    if dist[n] == -1 or nd < dist[n]:
+                        dist[n] = nd
+                        buckets[nd%10].append(n)
+                        pending += 1
+        d += 1
+    return None
 
-def visit(node, num_rows=R, num_cols=C):
-    return [
-        # The risks are all positive, hence using Manhattan distance
-        # as the heuristic cannot overestimate the cost of reaching
-        # the goal node.
-        ((r, c), risk(r, c), num_rows-1-r + num_cols-1-c)
-        for r, c in neighbors4(node, num_rows, num_cols)
-    ]
-
-path = a_star((0, 0), (R-1, C-1), visit)
-print(sum(risk(r, c) for (r, c), _ in path[1:]))
+def part1(grid):
+    return lowest_risk(grid)
 
 # --- Part Two ---
 #
@@ -209,8 +242,23 @@ print(sum(risk(r, c) for (r, c), _ in path[1:]))
 # Using the full map, what is the lowest total risk of any path from
 # the top left to the bottom right?
 
-def risk(r, c):
-    return (grid[r%R][c%C] + r//R + c//C - 1)%9 + 1
+def tile(grid, n):
+    # Returns the risk map formed by tiling the grid n times in each
+    # dimension.  shift[k] maps risk v to its value k tiles away,
+    # (v+k-1)%9+1.
+    shift = [bytes((v+k-1)%9+1 for v in range(256)) for k in range(9)]
+    rows = [bytes(grid.row(r)) for r in range(grid.num_rows)]
+    risks = bytearray()
+    for i in range(n):
+        for row in rows:
+            for j in range(n):
+                risks += row.translate(shift[(i+j)%9])
+    return Grid(n*grid.num_rows, n*grid.num_cols, risks)
+
+def part2(grid):
+    return lowest_risk(tile(grid, 5))
 
-path = a_star((0, 0), (5*R-1, 5*C-1), lambda n: visit(n, 5*R, 5*C))
-print(sum(risk(r, c) for (r, c), _ in path[1:]))
+if __name__ == "__main__":
+    grid = parse(open("15.in").read())
+    print(part1(grid))
+    print(part2(grid))
@@ -162,9 +162,8 @@
 # Decode the structure of your hexadecimal-encoded BITS transmission;
 # what do you get if you add up the version numbers in all packets?
 
-input = (
-    "".join(format(int(d, 16), "04b") for d in open("16.in").read().strip())
-)
+def parse(text):
+    return "".join(format(int(d, 16), "04b") for d in text.strip())
 
 class Packet:
 
@@ -210,8 +209,8 @@ class Packet:
             v += sum(p.sum_versions() for p in self.subpackets)
         return v
 
-p = Packet(input)
-print(p.sum_versions())
+def part1(input):
+    return Packet(input).sum_versions()
 
 # --- Part Two ---
 #
@@ -282,4 +281,10 @@ def evaluate(self):
         )
 Packet.evaluate = evaluate
 
-print(p.evaluate())
+def part2(input):
+    return Packet(input).evaluate()
+
+if __name__ == "__main__":
+    input = parse(open("16.in").read())
+    print(part1(input))
+    print(part2(input))
@@ -176,11 +176,12 @@ from common import lfilter
 from math import sqrt, ceil
 import re
 
-xmin, xmax, ymin, ymax = [
-    int(v) for v in re.findall(r"-?\d+", open("17.in").read())
-]
+def parse(text):
+    # Returns (xmin, xmax, ymin, ymax).
+    return tuple(int(v) for v in re.findall(r"-?\d+", text))
 
-def fire(vx, vy):
+def fire(target, vx, vy):
+    xmin, xmax, ymin, ymax = target
     trajectory = []
     x = y = 0
     target_hit = False
@@ -198,16 +199,19 @@ def fire(vx, vy):
     else:
         return None
 
-trajectories = lfilter(
-    lambda t: t != None,
-    [
-        fire(vx, vy)
-        for vx in range(ceil((sqrt(1+8*xmin)-1)/2), xmax+1)
-        for vy in range(ymin, -ymin)
-    ]
-)
+def trajectories(target):
+    xmin, xmax, ymin, ymax = target
+    return lfilter(
+        lambda t: t != None,
+        [
+            fire(target, vx, vy)
+            for vx in range(ceil((sqrt(1+8*xmin)-1)/2), xmax+1)
+            for vy in range(ymin, -ymin)
+        ]
+    )
 
-print(max(y for t in trajectories for x, y in t))
+def part1(target):
+    return max(y for t in trajectories(target) for x, y in t)
 
 # --- Part Two ---
 #
@@ -238,4 +242,10 @@ print(max(y for t in trajectories for x, y in t))
 # How many distinct initial velocity values cause the probe to be
 # within the target area after any step?
 
-print(len(trajectories))
+def part2(target):
+    return len(trajectories(target))
+
+if __name__ == "__main__":
+    target = parse(open("17.in").read())
+    print(part1(target))
+    print(part2(target))
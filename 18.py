@@ -220,7 +220,6 @@
 # but the explode operation would be difficult (or at least, very
 # messy) to implement.  We stick with strings instead.
 
-from common import lmap
 from functools import reduce as functools_reduce
 import re
 
@@ -285,9 +284,11 @@ def magnitude(s):
             stack.append(3*l + 2*r)
     return stack[0]
 
-nums = lmap(str.strip, open("18.in"))
+def parse(text):
+    return text.splitlines()
 
-print(magnitude(functools_reduce(add, nums)))
+def part1(nums):
+    return magnitude(functools_reduce(add, nums))
 
 # --- Part Two ---
 #
@@ -323,9 +324,13 @@ print(magnitude(functools_reduce(add, nums)))
 
 from itertools import product
 
-print(
-    max(
+def part2(nums):
+    return max(
         max(magnitude(add(a, b)), magnitude(add(b, a)))
         for a, b in product(nums, repeat=2)
     )
-)
+
+if __name__ == "__main__":
+    nums = parse(open("18.in").read())
+    print(part1(nums))
+    print(part2(nums))
@@ -440,8 +440,8 @@
 # reflections, and from there the axis offsets between the two
 # scanners.
 
-from common import pick, cmp, bfs, bfs_path
-from collections import namedtuple
+from common import pick, cmp, bfs_iter
+from collections import Counter, namedtuple
 from itertools import combinations, permutations
 from math import comb
 import re
@@ -500,12 +500,28 @@ class Transform(namedtuple("Transform_base", "p s o")):
     [ 0  0  0  1]
 
     Apply the transformation by treating it as a function and calling
-    it on a Point.
+    it on a Point, or to many points at once by calling apply_columns.
     """
 
     def __call__(self, point):
         return Point(*[point[self.p[i]]*self.s[i]+self.o[i] for i in axes])
 
+    def apply_columns(self, columns):
+        # Applies the transformation to a batch of points given as
+        # columns of coordinates (xs, ys, zs), and returns the
+        # transformed columns.  Each output column is a permuted input
+        # column with its sign and offset applied by a C-level map, so
+        # no per-point Python code runs and no Points are built.
+        return tuple(
+            list(
+                map(
+                    self.o[i].__add__ if self.s[i] == 1 else self.o[i].__sub__,
+                    columns[self.p[i]]
+                )
+            )
+            for i in axes
+        )
+
     def __mul__(self, other):
         # Returns the functional composition of this transformation
         # with another.
@@ -531,28 +547,33 @@ class Transform(namedtuple("Transform_base", "p s o")):
 # distinct distances, whereas Manhattan distance does not.  (Since we
 # use distances for comparisons only, we skip taking square roots.)
 
-scanners = [
-    set(
-        Point(*map(int, re.findall(r"-?\d+", l)))
-        for l in section.splitlines()[1:]
-    )
-    for section in open("19.in").read().split("\n\n")
-]
-S = len(scanners)  # number of scanners
-
-distances = []  # indexed by scanner
-for s in scanners:
-    d = {}
-    for p1, p2 in combinations(s, 2):
-        dist = p1.euclidean2(p2)
-        if dist in d:
-            if type(d[dist]) is list:
-                d[dist].append((p1, p2))
+def parse(text):
+    # Returns the scanners along with their alignment (see Step 3),
+    # which both parts need and which is computed only once.
+    scanners = [
+        set(
+            Point(*map(int, re.findall(r"-?\d+", l)))
+            for l in section.splitlines()[1:]
+        )
+        for section in text.split("\n\n")
+    ]
+    return scanners, align(scanners)
+
+def distance_tables(scanners):
+    distances = []  # indexed by scanner
+    for s in scanners:
+        d = {}
+        for p1, p2 in combinations(s, 2):
+            dist = p1.euclidean2(p2)
+            if dist in d:
+                if type(d[dist]) is list:
+                    d[dist].append((p1, p2))
+                else:
+                    d[dist] = [d[dist], (p1, p2)]
             else:
-                d[dist] = [d[dist], (p1, p2)]
-        else:
-            d[dist] = (p1, p2)
-    distances.append(d)
+                d[dist] = (p1, p2)
+        distances.append(d)
+    return distances
 
 # Step 2.  Compute transformations between those scanners that see
 # sufficiently many distances in common.
@@ -601,49 +622,68 @@ def make_transform(pdist, qdist, common):
     offsets = tuple(pa[i]-signs[i]*qa_p[i] for i in axes)
     return Transform(permutation, signs, offsets)
 
-transforms = {}  # {(i, j): Transform}
-for i, j in combinations(range(S), 2):
-    common = set(distances[i]) & set(distances[j])
-    if len(common) >= T:
-        assert all(
-            type(distances[i][d]) is tuple and type(distances[j][d]) is tuple
-            for d in common
-        )
-        transforms[(i, j)] = make_transform(distances[i], distances[j], common)
+def pairwise_transforms(scanners):
+    distances = distance_tables(scanners)
+    # Rather than intersect the distance tables of every pair of
+    # scanners, we index the scanners by the distances they see and
+    # count the distances each pair has in common.  Most distances are
+    # seen by only one or two scanners, so this is roughly linear in
+    # the number of distances.
+    seen_by = {}  # {distance: [scanner, ...]}
+    for i, d in enumerate(distances):
+        for dist in d:
+            seen_by.setdefault(dist, []).append(i)
+    shared = Counter(
+        pair for l in seen_by.values() for pair in combinations(l, 2)
+    )
+    transforms = {}  # {(i, j): Transform}
+    for (i, j), n in sorted(shared.items()):
+        if n >= T:
+            common = distances[i].keys() & distances[j].keys()
+            assert all(
+                type(distances[i][d]) is tuple
+                and type(distances[j][d]) is tuple
+                for d in common
+            )
+            transforms[(i, j)] = make_transform(
+                distances[i], distances[j], common
+            )
+    return transforms
 
 # Step 3.  Transform all points to the coordinate system of scanner 0.
 # We don't have transformations in hand for every possible pair of
 # scanners, but the transformations we do have form a directed graph
-# that connects all scanners.  We use breadth-first search to find a
-# path between a scanner and scanner 0, and compute a net
-# transformation.
-
-def transform(i, j):
-    # Returns a transformation from coordinate system j to coordinate
-    # system i.
-    if i == j:
-        return Transform.identity()
-    def visit(node, prev, dist, accum, seen):
-        if node == j:
-            raise StopIteration(bfs_path(node, seen))
-        return (
-            [a for a, b in transforms if b == node]
-            + [b for a, b in transforms if a == node]
-        )
-    path = bfs(i, visit)
-    t = Transform.identity()
-    for k in range(len(path)-1):
-        if (path[k], path[k+1]) in transforms:
-            t *= transforms[(path[k], path[k+1])]
-        else:
-            t *= transforms[(path[k+1], path[k])].inverse()
-    return t
-
-universe = set()
-for i in range(S):
-    t = transform(0, i)
-    universe.update(t(p) for p in scanners[i])
-print(len(universe))
+# that connects all scanners (and, since transformations can be
+# inverted, can be searched as an undirected one).  A single
+# breadth-first search from scanner 0 yields a tree of paths to all
+# other scanners, and we compose each scanner's net transformation
+# from its parent's as we go.
+
+def align(scanners):
+    # Returns the transformations from each scanner's coordinate
+    # system to scanner 0's.
+    transforms = pairwise_transforms(scanners)
+    # adjacent[i] maps j to the transformation from j to i.
+    adjacent = [{} for _ in scanners]
+    for (i, j), t in transforms.items():
+        adjacent[i][j] = t
+        adjacent[j][i] = t.inverse()
+    net = [None]*len(scanners)
+    seen = {}
+    for j, _ in bfs_iter(0, adjacent.__getitem__, seen):
+        i = seen[j]
+        net[j] = Transform.identity() if i == None else net[i]*adjacent[i][j]
+    assert None not in net
+    return net
+
+def part1(input):
+    # Beacons are transformed a scanner at a time, as columns, and
+    # deduplicated as plain coordinate tuples.
+    scanners, net = input
+    universe = set()
+    for t, s in zip(net, scanners):
+        universe.update(zip(*t.apply_columns(list(zip(*s)))))
+    return len(universe)
 
 # --- Part Two ---
 #
@@ -656,6 +696,12 @@ print(len(universe))
 #
 # What is the largest Manhattan distance between any two scanners?
 
-origin = Point(0, 0, 0)
-scanner_positions = [transform(0, i)(origin) for i in range(S)]
-print(max(a.manhattan(b) for a, b in combinations(scanner_positions, 2)))
+def part2(input):
+    origin = Point(0, 0, 0)
+    scanner_positions = [t(origin) for t in input[1]]
+    return max(a.manhattan(b) for a, b in combinations(scanner_positions, 2))
+
+if __name__ == "__main__":
+    input = parse(open("19.in").read())
+    print(part1(input))
+    print(part2(input))
@@ -152,38 +152,61 @@
 #
 # So tricky!  Our image enhancement algorithm (iea) is such that the
 # infinitely many dark pixels all turn light.  Fortunately, in the
-# next step they all turn dark again.  So we alternate between
-# recording light and dark pixels.
+# next step they all turn dark again.  So we store the finite image as
+# a Grid of 0/1 pixels, together with the value of all the pixels
+# beyond it (the background), and grow the grid by one pixel on each
+# side per step.
 
-iea, p2 = open("20.in").read().split("\n\n")
-assert iea[0] == "#" and iea[511] == "."
-image = {
-    (r, c)
-    for r, l in enumerate(p2.splitlines())
-    for c, p in enumerate(l)
-    if p == "#"
-}
+from common import Grid
 
-def enhance(image, image_records_dark_pixels):
-    # If the input image records light/dark pixels, the returned image
-    # records dark/light pixels.
-    new_image = set()
-    target = "#" if image_records_dark_pixels else "."
-    rmin, rmax = min(r for r, c in image), max(r for r, c in image)
-    cmin, cmax = min(c for r, c in image), max(c for r, c in image)
-    for r in range(rmin-1, rmax+2):
-        for c in range(cmin-1, cmax+2):
-            v = 0
-            for nr in [r-1, r, r+1]:
-                for nc in [c-1, c, c+1]:
-                    v <<= 1
-                    if image_records_dark_pixels^((nr, nc) in image):
-                        v |= 1
-            if iea[v] == target:
-                new_image.add((nr, nc))
-    return new_image
+lit = bytes.maketrans(b".#", b"\0\1")
 
-print(len(enhance(enhance(image, False), True)))
+def parse(text):
+    iea, p2 = text.split("\n\n")
+    iea = iea.encode().translate(lit)
+    # enhance below forms 9-bit numbers column by column rather than
+    # row by row, so we permute the algorithm to match: bit 8-(3*x+y)
+    # of a number formed column by column is the pixel in column x,
+    # row y of the 3x3 square, which is bit 8-(3*y+x) of the number
+    # formed row by row.
+    iea = bytes(
+        iea[sum(
+            (v>>(8-(3*x+y))&1)<<(8-(3*y+x)) for x in range(3) for y in range(3)
+        )]
+        for v in range(512)
+    )
+    return iea, Grid.parse(p2, lit)
+
+def enhance(iea, image, background):
+    # Returns the enhanced image and its background.
+    C = image.num_cols
+    # The image padded with 2 background pixels on each side.
+    pad = bytes([background])*2
+    rows = (
+        [bytes([background])*(C+4)]*2
+        + [pad + bytes(image.row(r)) + pad for r in range(image.num_rows)]
+        + [bytes([background])*(C+4)]*2
+    )
+    cells = bytearray()
+    for a, b, c in zip(rows, rows[1:], rows[2:]):
+        # The 3 pixels in each column of this 3-row band, as 3 bits.
+        cols = [x<<2|y<<1|z for x, y, z in zip(a, b, c)]
+        v = cols[0]<<3|cols[1]
+        for k in range(2, C+4):
+            v = (v<<3&511)|cols[k]
+            cells.append(iea[v])
+    return Grid(image.num_rows+2, C+2, cells), iea[511 if background else 0]
+
+def lit_after(scan, n):
+    iea, image = scan
+    background = 0
+    for _ in range(n):
+        image, background = enhance(iea, image, background)
+    assert background == 0
+    return sum(image.cells)
+
+def part1(scan):
+    return lit_after(scan, 2)
 
 # --- Part Two ---
 #
@@ -197,6 +220,10 @@ print(len(enhance(enhance(image, False), True)))
 # enhancement algorithm 50 times.  How many pixels are lit in the
 # resulting image?
 
-for _ in range(25):
-    image = enhance(enhance(image, False), True)
-print(len(image))
+def part2(scan):
+    return lit_after(scan, 50)
+
+if __name__ == "__main__":
+    scan = parse(open("20.in").read())
+    print(part1(scan))
+    print(part2(scan))
@@ -73,7 +73,9 @@
 
 from itertools import cycle, islice
 
-p1_start, p2_start = [int(l.split()[-1]) for l in open("21.in")]
+def parse(text):
+    # Returns the players' starting positions.
+    return tuple(int(l.split()[-1]) for l in text.splitlines())
 
 def roll_generator():
     s = cycle(range(1, 101))
@@ -90,7 +92,9 @@ def play(roll_generator, num_turns, p1, p1_score, p2, p2_score):
     else:
         return play(roll_generator, num_turns, p2, p2_score, p1, p1_score)
 
-print(play(roll_generator(), 0, p1_start, 0, p2_start, 0))
+def part1(start):
+    p1_start, p2_start = start
+    return play(roll_generator(), 0, p1_start, 0, p2_start, 0)
 
 # --- Part Two ---
 #
@@ -145,4 +149,11 @@ def wins(p1, p1_score, p2, p2_score):
             num_p2_wins += a*freq
     return (num_p1_wins, num_p2_wins)
 
-print(max(wins(p1_start, 0, p2_start, 0)))
+def part2(start):
+    p1_start, p2_start = start
+    return max(wins(p1_start, 0, p2_start, 0))
+
+if __name__ == "__main__":
+    start = parse(open("21.in").read())
+    print(part1(start))
+    print(part2(start))
@@ -165,67 +165,156 @@
 # within Y, would be discarded (and replaced by Y if Y is an "on"
 # cuboid, or simply removed if it is an "off" cuboid).
 
-from common import lfilter
-from collections import namedtuple
+from common import lines, ints, mapped
+from collections import Counter, namedtuple
 from itertools import product
-from functools import reduce
-from operator import mul
-import re
 
-class Span(namedtuple("Span_base", "min max")):
-    """A 1-dimensional range [min, max)."""
+def split(min, max, cuts):
+    # Returns the boundaries of the pieces of a 1-dimensional range
+    # [min, max) cut at those of a cuboid's two bounds along the same
+    # axis that fall strictly inside the range.
+    return [min] + [p for p in cuts if min < p < max] + [max]
 
-    def intersects(self, other):
-        return self.min < other.max and other.min < self.max
-
-    def contained_within(self, other):
-        return other.min <= self.min and self.max <= other.max
+class Cuboid(namedtuple("Cuboid_base", "xmin xmax ymin ymax zmin zmax")):
+    """A cuboid [xmin, xmax) x [ymin, ymax) x [zmin, zmax).
 
-    def subdivide(self, other):
-        l = []
-        prev = self.min
-        for p in other:
-            if self.min < p < self.max:
-                l.append(Span(prev, p))
-                prev = p
-        l.append(Span(prev, self.max))
-        return l
+    A cuboid is a flat tuple of six ints; with no per-axis objects and
+    no instance dictionary (__slots__ is empty), it is one Python
+    object where a tuple of three per-axis range tuples would be four,
+    which adds up with the millions of fragments a large reboot can
+    create.
+    """
 
-class Cuboid(namedtuple("Cuboid_base", "xspan yspan zspan")):
+    __slots__ = ()
 
     def intersects(self, other):
-        return all(s1.intersects(s2) for s1, s2 in zip(self, other))
+        ax0, ax1, ay0, ay1, az0, az1 = self
+        bx0, bx1, by0, by1, bz0, bz1 = other
+        return (
+            ax0 < bx1 and bx0 < ax1
+            and ay0 < by1 and by0 < ay1
+            and az0 < bz1 and bz0 < az1
+        )
 
     def contained_within(self, other):
-        return all(s1.contained_within(s2) for s1, s2 in zip(self, other))
+        ax0, ax1, ay0, ay1, az0, az1 = self
+        bx0, bx1, by0, by1, bz0, bz1 = other
+        return (
+            bx0 <= ax0 and ax1 <= bx1
+            and by0 <= ay0 and ay1 <= by1
+            and bz0 <= az0 and az1 <= bz1
+        )
 
     def subdivide(self, other):
+        xs = split(self[0], self[1], other[0:2])
+        ys = split(self[2], self[3], other[2:4])
+        zs = split(self[4], self[5], other[4:6])
         return [
-            Cuboid(xspan, yspan, zspan)
-            for xspan, yspan, zspan
-            in product(*[s1.subdivide(s2) for s1, s2 in zip(self, other)])
+            Cuboid(x0, x1, y0, y1, z0, z1)
+            for x0, x1 in zip(xs, xs[1:])
+            for y0, y1 in zip(ys, ys[1:])
+            for z0, z1 in zip(zs, zs[1:])
         ]
 
+    def intersection(self, other):
+        ax0, ax1, ay0, ay1, az0, az1 = self
+        bx0, bx1, by0, by1, bz0, bz1 = other
+        return Cuboid(
+            max(ax0, bx0), min(ax1, bx1),
+            max(ay0, by0), min(ay1, by1),
+            max(az0, bz0), min(az1, bz1)
+        )
+
     def volume(self):
-        return reduce(mul, [s.max-s.min for s in self])
+        x0, x1, y0, y1, z0, z1 = self
+        return (x1-x0)*(y1-y0)*(z1-z0)
 
-input = []
-for l in open("22.in"):
-    on_off = l.split()[0]
-    xmin, xmax, ymin, ymax, zmin, zmax = map(int, re.findall(r"-?\d+", l))
-    input.append(
-        (
-            on_off,
-            Cuboid(Span(xmin, xmax+1), Span(ymin, ymax+1), Span(zmin, zmax+1))
-        )
+class CuboidIndex:
+    """A set of cuboids that supports finding the cuboids that intersect
+    a given cuboid without examining them all.
+
+    Space is divided into cubic buckets of a given size, and each
+    cuboid is filed in the bucket containing its minimum corner.  A
+    cuboid intersecting Y must begin before Y ends along each axis, and
+    can begin no more than the widest (along that axis) cuboid ever
+    added before Y begins, so only the buckets in that range need be
+    examined.  Adding and removing a cuboid touches only its bucket.
+    """
+
+    def __init__(self, bucket_size):
+        self.bucket_size = bucket_size
+        self.buckets = {}  # {(i, j, k): set of cuboids}
+        self.widths = [0, 0, 0]  # widest cuboid ever added, per axis
+
+    def __iter__(self):
+        for b in self.buckets.values():
+            yield from b
+
+    def key(self, cuboid):
+        B = self.bucket_size
+        return (cuboid[0]//B, cuboid[2]//B, cuboid[4]//B)
+
+    def add(self, cuboid):
+        self.buckets.setdefault(self.key(cuboid), set()).add(cuboid)
+        for i in range(3):
+            self.widths[i] = max(self.widths[i], cuboid[2*i+1]-cuboid[2*i])
+
+    def remove(self, cuboid):
+        k = self.key(cuboid)
+        self.buckets[k].remove(cuboid)
+        if len(self.buckets[k]) == 0:
+            del self.buckets[k]
+
+    def intersecting(self, cuboid):
+        # Returns a list, so the caller may modify the index while
+        # iterating over it.
+        B = self.bucket_size
+        xr, yr, zr = ranges = [
+            range((cuboid[2*i]-w+1)//B, (cuboid[2*i+1]-1)//B+1)
+            for i, w in enumerate(self.widths)
+        ]
+        # Enumerate the bucket keys in range or the nonempty buckets,
+        # whichever is fewer.
+        if len(xr)*len(yr)*len(zr) <= len(self.buckets):
+            keys = [k for k in product(*ranges) if k in self.buckets]
+        else:
+            keys = [
+                k for k in self.buckets
+                if k[0] in xr and k[1] in yr and k[2] in zr
+            ]
+        return [
+            c for k in keys for c in self.buckets[k] if c.intersects(cuboid)
+        ]
+
+def new_index(cuboid_list):
+    # Returns an empty CuboidIndex with buckets sized for a list of
+    # reboot steps: a quarter of the steps' median width, so that a
+    # query examines a handful of buckets along each axis.
+    widths = sorted(
+        c[2*i+1]-c[2*i] for _, c in cuboid_list for i in range(3)
     )
+    return CuboidIndex(max(widths[len(widths)//2]//4, 1) if widths else 1)
+
+def parse(text):
+    input = []
+    for l in lines(text):
+        on_off = l.split()[0]
+        xmin, xmax, ymin, ymax, zmin, zmax = ints(l)
+        input.append(
+            (on_off, Cuboid(xmin, xmax+1, ymin, ymax+1, zmin, zmax+1))
+        )
+    return input
+
+def load(filename):
+    return parse(mapped(filename))
 
 def solve(cuboid_list):
-    cuboids = set()  # disjoint
+    cuboid_list = list(cuboid_list)
+    cuboids = new_index(cuboid_list)  # disjoint
     for on_off, cuboid in cuboid_list:
         # Subtle: we will be modifying the cuboids set within the
-        # loop, so we materialize the filter before entering the loop.
-        for c in lfilter(lambda c: c.intersects(cuboid), cuboids):
+        # loop, but intersecting returns a list.
+        for c in cuboids.intersecting(cuboid):
             cuboids.remove(c)
             for cc in c.subdivide(cuboid):
                 if not cc.intersects(cuboid):
@@ -234,8 +323,48 @@ def solve(cuboid_list):
             cuboids.add(cuboid)
     return sum(c.volume() for c in cuboids)
 
-part1_range = Cuboid(Span(-50, 51), Span(-50, 51), Span(-50, 51))
-print(solve(filter(lambda t: t[1].contained_within(part1_range), input)))
+# An alternative engine based on inclusion-exclusion.  Rather than
+# keeping the cuboids disjoint, we keep a multiset of possibly
+# overlapping cuboids with signed (integer) weights, such that the
+# number of cubes on is the weighted sum of the cuboids' volumes.  To
+# apply a reboot step Y, for every cuboid X of weight w intersecting Y
+# we add the intersection of X and Y with weight -w, which exactly
+# cancels the contribution of the cubes in Y; if Y is "on" we then add
+# Y itself with weight 1.  No cuboid is ever cut into pieces, and
+# equal cuboids are merged and dropped when their weights cancel,
+# which keeps the multiset small.  Intersecting cuboids are found
+# using a CuboidIndex.  This engine is several times faster than the
+# disjoint one, and is the one used by the parts below.
+
+def solve_signed(cuboid_list):
+    cuboid_list = list(cuboid_list)
+    weights = {}  # {cuboid: weight}, weights nonzero
+    index = new_index(cuboid_list)  # of the cuboids in `weights`
+    for on_off, cuboid in cuboid_list:
+        update = Counter()
+        for c in index.intersecting(cuboid):
+            update[c.intersection(cuboid)] -= weights[c]
+        if on_off == "on":
+            update[cuboid] += 1
+        for c, w in update.items():
+            if c in weights:
+                w += weights[c]
+                if w == 0:
+                    del weights[c]
+                    index.remove(c)
+                else:
+                    weights[c] = w
+            elif w != 0:
+                weights[c] = w
+                index.add(c)
+    return sum(w*c.volume() for c, w in weights.items())
+
+part1_range = Cuboid(-50, 51, -50, 51, -50, 51)
+
+def part1(input):
+    return solve_signed(
+        filter(lambda t: t[1].contained_within(part1_range), input)
+    )
 
 # --- Part Two ---
 #
@@ -315,4 +444,10 @@ print(solve(filter(lambda t: t[1].contained_within(part1_range), input)))
 # Starting again with all cubes off, execute all reboot steps.
 # Afterward, considering all cubes, how many cubes are on?
 
-print(solve(input))
+def part2(input):
+    return solve_signed(input)
+
+if __name__ == "__main__":
+    input = load("22.in")
+    print(part1(input))
+    print(part2(input))
@@ -150,53 +150,63 @@
 # the amphipods animated.
 
 from common import a_star
-from collections import namedtuple
+from string import ascii_uppercase
 import sys
-from time import sleep
-
-visualize = (len(sys.argv) > 1 and sys.argv[1] == "visualize")
-if visualize:
-    import curses
-    stdscr = curses.initscr()
-
-# N.B.: Of the constants below, only the room depth is truly variable.
-
-R = H = 4  # number of rooms; hallway index
-D = 2  # room depth
-
-cost_factor = {"A": 1, "B": 10, "C": 100, "D": 1000}
-room_type = ["A", "B", "C", "D"]
-room_pos = [2, 4, 6, 8]  # relative to hallway
-goal_pos = {"A": 2, "B": 4, "C": 6, "D": 8}  # relative to hallway
-goal_idx = {"A": 0, "B": 1, "C": 2, "D": 3}
-
-class Room(str):
-    """A room with occupants listed in order of depth, e.g., ".A"."""
-
-    def occupants(self):
-        return [(a, d) for d, a in enumerate(self) if a != "."]
-
-    def first_occupant(self):
-        try:
-            return self.occupants()[0]
-        except IndexError:
-            return (None, -1)
-
-    def enterable(self, type):
-        # Returns True if the room can be entered by an amphipod that
-        # has the room as its goal, which is to say, is only occupied
-        # by amphipods of type `type`, the correct type.
-        return all(self[d] == "." or self[d] == type for d in range(D))
-
-    def num_open_spaces(self):
-        return self.count(".")
-
-class State(namedtuple("State_base", "room_a room_b room_c room_d hallway")):
-    """An amphipod state.
-
-    A state is represented as a tuple of 5 strings: (room A, room B,
-    room C, room D, hallway).  Room occupants are listed in vertical
-    descending order.  For example, the state
+from time import perf_counter, sleep
+
+# N.B.: The burrow's geometry is not fixed; it is determined by the
+# diagram.  The puzzle's burrows have 4 rooms, of depth 2 (part 1) or
+# 4 (part 2), off an 11-space hallway, but any number of rooms up to 7
+# at any positions, of any depth, off any width of hallway will do.
+# There are as many amphipod types (A, B, C, ...) as rooms, the energy
+# per step of each type being 10 times that of the previous.
+
+def low_bits(n):
+    # Returns a mask of the low bits of n 3-bit spaces.
+    return int("001"*n, 2) if n > 0 else 0
+
+def occupied(bits, low):
+    # Returns the low bits of the occupied spaces among `bits`, `low`
+    # being the low bits of all the spaces.
+    return (bits | bits >> 1 | bits >> 2) & low
+
+def spaces(mask):
+    # Yields the indexes of the spaces whose low bits are set in a
+    # mask, in increasing order.
+    while mask:
+        low = mask & -mask
+        yield (low.bit_length()-1)//3
+        mask ^= low
+
+def deadlocks(walkers, i, p):
+    # Returns True if moving an amphipod whose goal room is at hallway
+    # position p into hallway position i would deadlock it with one of
+    # the amphipods already in the hallway, listed in `walkers` as
+    # pairs (position, goal room position).  Amphipods in the hallway
+    # can only move into their goal rooms, so if each of two of them
+    # stands between the other and its goal room, neither can ever
+    # move.
+    for j, q in walkers:
+        if (i < j < p and q < i) or (p < j < i and i < q):
+            return True
+    return False
+
+def space_mask(*spaces):
+    # Returns a mask of all the bits of the given spaces.
+    return sum(7 << 3*i for i in spaces)
+
+class Burrow:
+    """The geometry of a burrow, and the amphipod states within it.
+
+    A burrow has a hallway of width W and N rooms of depth D, room r
+    (0 <= r < N) being entered from hallway position room_pos[r] and
+    being the goal room of amphipod type r+1.
+
+    A state is a single int packing 3 bits per space: the W hallway
+    spaces come first, left to right, followed by the spaces of each
+    room in order of depth.  An amphipod is recorded by its type, A-G
+    as 1-7, and an empty space as 0.  For example, in the puzzle's
+    burrow the state
 
     #############
     #.....D.D.A.#
@@ -204,115 +214,308 @@ class State(namedtuple("State_base", "room_a room_b room_c room_d hallway")):
       #A#B#C#.#
       #########
 
-    is represented as
-
-    (Room(".A"), Room("BB"), Room("CC"), Room(".."), ".....D.D.A.").
+    has hallway space 5 (bits 15-17) equal to 4, room A's spaces
+    (bits 33-35 and 36-38) equal to 0 and 1, and so forth.  Moving an
+    amphipod of type a from space i to empty space j is then just
+    state ^ a<<3*i ^ a<<3*j, and states hash and compare as ints.
     """
 
-    @staticmethod
-    def new(lines):
-        rooms = [
-            Room("".join(lines[d+2][r*2+3] for d in range(D)))
-            for r in range(R)
+    def __init__(self, room_pos, depth, width):
+        assert 0 < len(room_pos) <= 7
+        assert all(0 < p < width-1 for p in room_pos)
+        self.room_pos = room_pos
+        self.num_rooms = N = len(room_pos)
+        self.depth = depth
+        self.width = width
+        self.types = "." + ascii_uppercase[:N]  # type 0 is empty
+        self.cost_factor = [None] + [10**r for r in range(N)]
+        self.hallway_mask = (1 << 3*width) - 1
+        self.hallway_low = low_bits(width)
+        self.room_mask = (1 << 3*depth) - 1  # of a room's bits
+        self.room_low = low_bits(depth)
+        self.room_shift = [3*self.space(r, 0) for r in range(N)]
+        self.goal = sum(
+            r+1 << 3*self.space(r, d) for r in range(N) for d in range(depth)
+        )
+        # The hallway's part of the heuristic is a sum of independent
+        # per-space costs, so we tabulate it for every combination of
+        # contents of each chunk of 4 consecutive spaces: h_tables
+        # lists pairs (shift, table), table[v] being the cost of the
+        # chunk's contents v.  Each room's part depends on the room's
+        # contents only, and is memoized in room_h[r] as encountered.
+        self.h_tables = [
+            (
+                3*k,
+                [
+                    sum(
+                        self.hallway_cost(k+c, v >> 3*c & 7)
+                        for c in range(min(4, width-k))
+                    )
+                    for v in range(1 << 12)
+                ]
+            )
+            for k in range(0, width, 4)
         ]
-        return State(*rooms, lines[1][1:-1])
-
-    def __str__(self):
-        rooms = [
-            "#" + "".join(f"{self[r][d]}#" for r in range(R))
-            for d in range(D)
+        self.room_h = [{} for _ in range(N)]
+        self.hallway_h = [
+            [self.hallway_cost(i, a) for a in range(8)] for i in range(width)
+        ]
+        # Precomputed paths.  A move is legal if no space on its path
+        # (excluding the starting space, including the ending space) is
+        # occupied, i.e., if the state ANDed with a mask of the path's
+        # spaces is zero.  exits[s] lists triples (i, mask, distance)
+        # for the moves from room space s to the hallway spaces i not
+        # in front of rooms; entries[t][i] is (mask, distance) for the
+        # move from hallway space i to room space t; and
+        # transfers[s][t] likewise for the move from room space s
+        # directly to room space t in another room.
+        stops = [i for i in range(width) if i not in room_pos]
+        slots = [(r, d) for r in range(N) for d in range(depth)]
+        self.exits = [None]*width + [
+            [
+                (
+                    i,
+                    self.path_mask(r, d, i) | space_mask(i),
+                    d+1+abs(room_pos[r]-i)
+                )
+                for i in stops
+            ]
+            for r, d in slots
         ]
-        return (
-            f"#############\n#{self.hallway}#\n##{rooms[0]}##\n"
-            + "\n".join("  "+r for r in rooms[1:])
-            + "\n  #########"
+        self.entries = [None]*width + [
+            [
+                (
+                    self.path_mask(r, d, i) | space_mask(self.space(r, d)),
+                    abs(room_pos[r]-i)+d+1
+                )
+                for i in range(width)
+            ]
+            for r, d in slots
+        ]
+        self.transfers = [None]*width + [
+            [None]*width + [
+                (
+                    self.path_mask(r, d, room_pos[gr])
+                    | self.path_mask(gr, gd, room_pos[gr])
+                    | space_mask(room_pos[gr])
+                    | space_mask(self.space(gr, gd)),
+                    d+1+abs(room_pos[r]-room_pos[gr])+gd+1
+                )
+                for gr, gd in slots
+            ]
+            for r, d in slots
+        ]
+
+    def path_mask(self, r, d, i):
+        # Returns a mask of the spaces strictly between the space at
+        # depth d in room r and hallway space i: those above it in the
+        # room, and those along the hallway from the room's entrance
+        # up to but excluding i.
+        p = self.room_pos[r]
+        return space_mask(
+            *[self.space(r, k) for k in range(d)],
+            *[j for j in range(min(p, i), max(p, i)+1) if j != i]
+        )
+
+    @staticmethod
+    def new(lines):
+        # Returns a burrow and the state described by a diagram.
+        room_pos = [i-1 for i, c in enumerate(lines[2]) if c not in "# "]
+        burrow = Burrow(room_pos, len(lines)-3, len(lines[1])-2)
+        return burrow, burrow.encode(lines)
+
+    def space(self, r, d):
+        # Returns the index of the space at depth d in room r.
+        return self.width + r*self.depth + d
+
+    def encode(self, lines):
+        # Returns the state described by a diagram.
+        spaces = lines[1][1:-1] + "".join(
+            lines[d+2][p+1] for p in self.room_pos for d in range(self.depth)
+        )
+        return sum(self.types.index(a) << 3*i for i, a in enumerate(spaces))
+
+    def decode(self, state):
+        # Returns the diagram of a state.
+        W = self.width
+        first, last = self.room_pos[0], self.room_pos[-1]
+        def t(i):
+            return self.types[state >> 3*i & 7]
+        def row(d):
+            # Returns row d of the diagram below the hallway, which is
+            # the rooms' row d for 0 <= d < D, or the bottom wall.
+            if d == 0:
+                l = ["#"]*(W+2)
+            else:
+                l = [" "]*first + ["#"]*(last-first+3)
+            if d < self.depth:
+                for r, p in enumerate(self.room_pos):
+                    l[p+1] = t(self.space(r, d))
+            return "".join(l)
+        return "\n".join(
+            ["#"*(W+2), "#" + "".join(t(i) for i in range(W)) + "#"]
+            + [row(d) for d in range(self.depth+1)]
         )
 
-    def hallway_range(self, r):
-        # Returns the range of hallway positions that are accessible
-        # from the room at room index `r`.
-        i = room_pos[r]
-        while i >= 0 and self.hallway[i] == ".":
-            i -= 1
-        j = room_pos[r]
-        while j < len(self.hallway) and self.hallway[j] == ".":
-            j += 1
-        return range(i+1, j)
-
-    def enterable(self, r):
-        # Returns True if the room at room index `r` is enterable.
-        return self[r].enterable(room_type[r])
-
-    def move(self, from_r, from_d, to_r, to_d):
-        # Returns a new state that reflects moving an amphipod.  An
-        # amphipod position is described by a room index and depth
-        # (the hallway is treated as a room here).
-        l = [list(room) for room in self]
-        l[from_r][from_d], l[to_r][to_d] = l[to_r][to_d], l[from_r][from_d]
-        return State(*[Room("".join(r)) for r in l[:R]], "".join(l[H]))
-
-    def next_moves(self):
+    def room(self, state, r):
+        # Returns the bits of room r, shifted down.
+        return state >> self.room_shift[r] & self.room_mask
+
+    def enterable(self, state, r):
+        # Returns the number of open spaces in room r if it can be
+        # entered by an amphipod that has the room as its goal, which
+        # is to say, is only occupied by amphipods of the correct type,
+        # or else None.  (Multiplying the occupied spaces' low bits by
+        # the type fills in the type in just those spaces.)
+        bits = self.room(state, r)
+        o = occupied(bits, self.room_low)
+        if bits != o*(r+1):
+            return None
+        return self.depth - bin(o).count("1")
+
+    def next_moves(self, state):
+        # The heuristic value of each new state is computed from this
+        # state's, adjusting for the one or two rooms and/or hallway
+        # spaces changed by the move.
+        room_pos, cost_factor = self.room_pos, self.cost_factor
+        room_cost, hallway_h = self.room_cost, self.hallway_h
+        h = self.h_func(state)
+        hallway = occupied(state & self.hallway_mask, self.hallway_low)
+        # Hallway positions and goal room positions of the amphipods
+        # in the hallway.
+        walkers = [
+            (i, room_pos[(state >> 3*i & 7)-1]) for i in spaces(hallway)
+        ]
         l = []
-        def add(new_state, type, distance):
-            l.append(
-                (new_state, distance*cost_factor[type], new_state.h_func())
+        def goal_slot(a):
+            # Returns (goal room space, heuristic delta of filling it)
+            # for an amphipod of type a if its goal room can be
+            # entered, or else None.
+            gr = a-1  # goal room
+            gd = self.enterable(state, gr)  # goal room depth
+            if gd == None:
+                return None
+            bits = self.room(state, gr)
+            return (
+                self.space(gr, gd-1),
+                room_cost(gr, bits ^ a << 3*(gd-1)) - room_cost(gr, bits)
             )
         # Case 1: amphipods that can be moved out of their current
         # rooms, to the hallway or directly to their goal rooms.
-        for r in range(R):  # for each room
+        for r in range(self.num_rooms):  # for each room
             # Only the first occupant can be moved (all others are
             # blocked).  But if the first occupant and all others in
             # the room are already of the correct type, there is
             # nothing gained by moving it.
-            a, d = self[r].first_occupant()
-            if a != None and not self.enterable(r):
-                hr = self.hallway_range(r)
-                # Case 1a: moves to the hallway.
-                for i in hr:
-                    if i not in room_pos:  # avoid spaces in front of rooms
-                        add(self.move(r, d, H, i), a, abs(room_pos[r]-i)+d+1)
-                # Case 1b: move to the goal room.
-                gr = goal_idx[a]  # goal room
-                if gr != r and room_pos[gr] in hr and self.enterable(gr):
-                    gd = self[gr].num_open_spaces()  # goal room depth
-                    add(
-                        self.move(r, d, gr, gd-1),
-                        a,
-                        abs(room_pos[r]-room_pos[gr])+d+1+gd
+            bits = self.room(state, r)
+            if bits == 0 or self.enterable(state, r) != None:
+                continue
+            d = ((bits & -bits).bit_length()-1)//3
+            a = bits >> 3*d & 7
+            s = self.space(r, d)
+            moved = state ^ a << 3*s
+            hr = h + room_cost(r, bits ^ a << 3*d) - room_cost(r, bits)
+            gp = room_pos[a-1]  # goal room position
+            # Case 1a: moves to the hallway, avoiding deadlocks.
+            for i, mask, distance in self.exits[s]:
+                if state & mask == 0 and not deadlocks(walkers, i, gp):
+                    l.append(
+                        (
+                            moved ^ a << 3*i,
+                            distance*cost_factor[a],
+                            hr + hallway_h[i][a]
+                        )
                     )
+            # Case 1b: move to the goal room.
+            if a-1 != r:
+                goal = goal_slot(a)
+                if goal != None:
+                    t, dh = goal
+                    mask, distance = self.transfers[s][t]
+                    if state & mask == 0:
+                        l.append(
+                            (
+                                moved ^ a << 3*t,
+                                distance*cost_factor[a],
+                                hr + dh
+                            )
+                        )
         # Case 2: amphipods that can be moved from the hallway to
         # their goal rooms.
-        for i, a in enumerate(self.hallway):
-            if a != ".":
-                gr = goal_idx[a]  # goal room
-                hr = self.hallway_range(gr)
-                if (i-1 in hr or i+1 in hr) and self.enterable(gr):
-                    gd = self[gr].num_open_spaces()  # goal room depth
-                    add(
-                        self.move(H, i, gr, gd-1),
-                        a,
-                        abs(i-room_pos[gr])+gd
+        for i, _ in walkers:
+            a = state >> 3*i & 7
+            goal = goal_slot(a)
+            if goal != None:
+                t, dh = goal
+                mask, distance = self.entries[t][i]
+                if state & mask == 0:
+                    l.append(
+                        (
+                            state ^ a << 3*i ^ a << 3*t,
+                            distance*cost_factor[a],
+                            h - hallway_h[i][a] + dh
+                        )
                     )
         return l
 
-    def h_func(self):
-        # Our heuristic function for the A* search returns a good, but
-        # underestimated cost by taking into account the distance each
-        # out-of-place amphipod needs to travel out of its current
-        # room, along the hallway, and at least one step down into its
-        # goal room.  Other required moves (e.g., to get out of the
-        # way) are not considered.
+    # Our heuristic function for the A* search returns an
+    # underestimate of the remaining cost by adding up the minimum
+    # energy needed for three kinds of moves:
+    #
+    # - Every amphipod in a room that is above (or is) an amphipod of
+    #   the wrong type must leave the room, climbing to the hallway and
+    #   walking to its goal room's entrance.  An amphipod of the
+    #   correct type that must make way for one below it walks at
+    #   least 2 spaces, out and back.
+    # - Every amphipod in the hallway must walk to its goal room's
+    #   entrance.
+    # - If e amphipods must enter a room, they fill its e lowest
+    #   unsettled spaces, taking e + (e-1) + ... + 1 steps in all.
+    #
+    # Other required moves (e.g., to step aside in the hallway) are not
+    # considered.
+
+    def hallway_cost(self, i, a):
+        # Returns the heuristic cost of an amphipod of type a (or
+        # nothing, or an invalid type) in hallway space i.
+        if not 1 <= a <= self.num_rooms:
+            return 0
+        return abs(i-self.room_pos[a-1])*self.cost_factor[a]
+
+    def room_cost(self, r, bits):
+        # Returns the heuristic cost of room r with contents `bits`:
+        # that of the amphipods that must leave, and of those that
+        # must enter.  Costs are memoized in room_h.
+        h = self.room_h[r].get(bits)
+        if h == None:
+            h = self.room_h[r][bits] = self.compute_room_cost(r, bits)
+        return h
+
+    def compute_room_cost(self, r, bits):
+        types = [bits >> 3*d & 7 for d in range(self.depth)]
+        wrong = [d for d, a in enumerate(types) if a != 0 and a != r+1]
+        if len(wrong) > 0:
+            settled = self.depth-1-wrong[-1]
+        else:
+            settled = self.depth - types.count(0)
+        h = 0
+        for d, a in enumerate(types[:self.depth-settled]):
+            if a != 0:
+                distance = abs(self.room_pos[r]-self.room_pos[a-1]) or 2
+                h += (d+1+distance)*self.cost_factor[a]
+        e = self.depth-settled  # number of amphipods that must enter
+        return h + e*(e+1)//2*self.cost_factor[r+1]
+
+    def h_func(self, state):
         h = 0
-        for r in range(R):
-            for a, d in self[r].occupants():
-                if a != room_type[r]:
-                    h += (abs(room_pos[r]-goal_pos[a])+d+2)*cost_factor[a]
-        for i, a in enumerate(self.hallway):
-            if a != ".":
-                h += (abs(i-goal_pos[a])+1)*cost_factor[a]
+        for shift, table in self.h_tables:
+            h += table[state >> shift & 0o7777]
+        for r in range(self.num_rooms):
+            h += self.room_cost(r, self.room(state, r))
         return h
 
-def animate(states):
+def animate(stdscr, states):
+    import curses
     def draw(s, highlight_idx=None):
         stdscr.clear()
         for i in range(len(s)):
@@ -320,7 +523,7 @@ def animate(states):
         stdscr.refresh()
         sleep(.5)
     prev_s = None
-    for s in map(str, states):
+    for s in states:
         if prev_s != None:
             from_ = to = None
             for i in range(len(s)):
@@ -335,22 +538,28 @@ def animate(states):
         sleep(.5)
         prev_s = s
 
-start = open("23.in").read().splitlines()
-
-goal = [
-    "#############",
-    "#...........#",
-    "###A#B#C#D###",
-    "  #A#B#C#D#",
-    "  #########"
-]
-
-path = a_star(State.new(start), State.new(goal), State.next_moves)
-
-if visualize:
-    animate(p[0] for p in path)
-else:
-    print(path[-1][1])
+def parse(text):
+    return text.splitlines()
+
+def organize(start, stats=None):
+    # Returns a lowest energy path [(state diagram, cumulative energy),
+    # ...], or None if the amphipods can't be organized.  If a
+    # dictionary `stats` is supplied, search statistics are stored in
+    # it (see common.a_star), plus the elapsed time ("seconds") and
+    # expansion rate ("states_per_second").
+    burrow, state = Burrow.new(start)
+    if stats == None:
+        stats = {}
+    t = perf_counter()
+    path = a_star(state, burrow.goal, burrow.next_moves, stats)
+    stats["seconds"] = perf_counter()-t
+    stats["states_per_second"] = stats["expanded"]/stats["seconds"]
+    if path == None:
+        return None
+    return [(burrow.decode(state), energy) for state, energy in path]
+
+def part1(start):
+    return organize(start)[-1][1]
 
 # --- Part Two ---
 #
@@ -583,15 +792,31 @@ else:
 # Using the initial configuration from the full diagram, what is the
 # least energy required to organize the amphipods?
 
-D = 4
-
-start = start[:3] + ["  #D#C#B#A#", "  #D#B#A#C#"] + start[3:]
-goal  = goal[:3]  + ["  #A#B#C#D#", "  #A#B#C#D#"] + goal[3:]
-
-path = a_star(State.new(start), State.new(goal), State.next_moves)
-
-if visualize:
-    animate(p[0] for p in path)
-    curses.endwin()
-else:
-    print(path[-1][1])
+def unfold(start):
+    return start[:3] + ["  #D#C#B#A#", "  #D#B#A#C#"] + start[3:]
+
+def part2(start):
+    return organize(unfold(start))[-1][1]
+
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else None
+    start = parse(open("23.in").read())
+    if mode == "visualize":
+        import curses
+        stdscr = curses.initscr()
+        animate(stdscr, (p[0] for p in organize(start)))
+        animate(stdscr, (p[0] for p in organize(unfold(start))))
+        curses.endwin()
+    elif mode == "stats":
+        for diagram in [start, unfold(start)]:
+            stats = {}
+            print(organize(diagram, stats)[-1][1])
+            print(
+                f"  {stats['expanded']} states expanded,"
+                f" peak frontier {stats['peak_frontier']},"
+                f" {stats['seconds']:.3f}s,"
+                f" {stats['states_per_second']:.0f} states/s"
+            )
+    else:
+        print(part1(start))
+        print(part2(start))
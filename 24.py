@@ -233,7 +233,12 @@
 #
 # At this point the maximum valid model number can simply be read off.
 
-print(99691891979938)
+def parse(text):
+    return text.splitlines()
+
+def part1(program):
+    # Solved by hand; see above.
+    return 99691891979938
 
 # --- Part Two ---
 #
@@ -243,4 +248,10 @@ print(99691891979938)
 #
 # What is the smallest model number accepted by MONAD?
 
-print(27141191213911)
+def part2(program):
+    return 27141191213911
+
+if __name__ == "__main__":
+    program = parse(open("24.in").read())
+    print(part1(program))
+    print(part2(program))
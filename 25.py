@@ -320,33 +320,42 @@
 # Find somewhere safe to land your submarine.  What is the first step
 # on which no sea cucumbers move?
 
-from common import lfilter
+from common import Grid, mapped
 from itertools import takewhile, count
 
-grid = [list(l.strip()) for l in open("25.in")]
-R, C = len(grid), len(grid[0])  # grid dimensions
+EAST, SOUTH, EMPTY = b">v."
 
-def step():
+def parse(text):
+    return Grid.parse(text)
+
+def load(filename):
+    return parse(mapped(filename))
+
+def step(grid):
+    cells, R, C = grid.cells, grid.num_rows, grid.num_cols
     n = 0
     for r in range(R):
-        for c in lfilter(
-            lambda c: grid[r][c] == ">" and grid[r][(c+1)%C] == ".",
-            range(C)
-        ):
-            grid[r][c] = "."
-            grid[r][(c+1)%C] = ">"
+        base = r*C
+        for c in [
+            c for c in range(C)
+            if cells[base+c] == EAST and cells[base+(c+1)%C] == EMPTY
+        ]:
+            cells[base+c] = EMPTY
+            cells[base+(c+1)%C] = EAST
             n += 1
     for c in range(C):
-        for r in lfilter(
-            lambda r: grid[r][c] == "v" and grid[(r+1)%R][c] == ".",
-            range(R)
-        ):
-            grid[r][c] = "."
-            grid[(r+1)%R][c] = "v"
+        for r in [
+            r for r in range(R)
+            if cells[r*C+c] == SOUTH and cells[(r+1)%R*C+c] == EMPTY
+        ]:
+            cells[r*C+c] = EMPTY
+            cells[(r+1)%R*C+c] = SOUTH
             n += 1
     return n
 
-print(list(takewhile(lambda _: step() > 0, count(1)))[-1] + 1)
+def part1(grid):
+    grid = grid.copy()
+    return list(takewhile(lambda _: step(grid) > 0, count(1)))[-1] + 1
 
 # --- Part Two ---
 #
@@ -379,4 +388,10 @@ print(list(takewhile(lambda _: step() > 0, count(1)))[-1] + 1)
 #
 # Only 49 stars to go.
 
-print("DONE!")
+def part2(grid):
+    return "DONE!"
+
+if __name__ == "__main__":
+    grid = load("25.in")
+    print(part1(grid))
+    print(part2(grid))
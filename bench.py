@@ -0,0 +1,130 @@
+"""Benchmark the solutions on generated inputs of increasing size.
+
+Usage:
+
+    python bench.py [--budget SECONDS] [--json FILE] [DAY ...]
+
+For each day having an input generator (see gen.py), the solution is
+run on inputs of increasing size, and the parse, part 1, and part 2
+stages are timed separately.  Once a run takes longer than the budget
+(10 seconds by default), larger sizes of that day are skipped.
+
+The empirical complexity of each stage is estimated as the slope of a
+least-squares fit of log(time) against log(n): a stage reported as
+n^2.0 takes four times as long when n doubles.
+"""
+
+from gen import generate, generators
+from run import load_day
+from math import log
+from time import perf_counter
+import argparse
+import json
+
+# Input sizes to benchmark; see gen.py for what n means for each day.
+sizes = {
+    "01": [10000, 20000, 40000, 80000, 160000],
+    "02": [10000, 20000, 40000, 80000, 160000],
+    "03": [1000, 2000, 4000, 8000, 16000],
+    "04": [100, 200, 400, 800, 1600],
+    "05": [250, 500, 1000, 2000, 4000],
+    "06": [10000, 20000, 40000, 80000, 160000],
+    "07": [125, 250, 500, 1000, 2000],
+    "08": [1000, 2000, 4000, 8000, 16000],
+    "09": [50, 100, 200, 400, 800],
+    "10": [1000, 2000, 4000, 8000, 16000],
+    "11": [25, 50, 100, 200],
+    "12": [4, 6, 8, 10, 12],
+    "13": [1000, 2000, 4000, 8000, 16000],
+    "14": [1000, 2000, 4000, 8000, 16000],
+    "15": [25, 50, 100, 200, 400],
+    "16": [100, 200, 400, 800, 1600],
+    "17": [50, 100, 200, 400],
+    "18": [25, 50, 100, 200],
+    "19": [10, 20, 40, 80],
+    "20": [25, 50, 100, 200],
+    "22": [25, 50, 100, 200, 400],
+    "23": [2, 3, 4, 5],
+    "25": [25, 50, 100, 200]
+}
+
+stages = ["parse", "part1", "part2"]
+
+# Parts that can't be run on generated inputs.  Day 11: octopuses in
+# a random grid need not ever all flash simultaneously.  Day 23: part
+# 2 unfolds the diagram with the puzzle's fixed 4-room lines.
+skip = {"11": [2], "23": [2]}
+
+def bench_day(day, budget):
+    """Return a list of records {day, n, parse, part1, part2} for a day,
+    times in seconds (None if skipped).
+    """
+    module = load_day(day)
+    records = []
+    for n in sizes[day]:
+        text = generate(day, n)
+        record = dict(day=day, n=n)
+        start = perf_counter()
+        parsed = module.parse(text)
+        record["parse"] = perf_counter()-start
+        for part, fn in [(1, module.part1), (2, module.part2)]:
+            if part in skip.get(day, []):
+                record[f"part{part}"] = None
+                continue
+            start = perf_counter()
+            fn(parsed)
+            record[f"part{part}"] = perf_counter()-start
+        records.append(record)
+        if sum(record[s] or 0 for s in stages) > budget:
+            break
+    return records
+
+def exponent(points):
+    # Returns the slope of the least-squares fit of log(t) against
+    # log(n), ignoring times too small to measure reliably.
+    points = [(log(n), log(t)) for n, t in points if t != None and t > 1e-3]
+    if len(points) < 2:
+        return None
+    mx = sum(x for x, _ in points)/len(points)
+    my = sum(y for _, y in points)/len(points)
+    sxx = sum((x-mx)**2 for x, _ in points)
+    return sum((x-mx)*(y-my) for x, y in points)/sxx
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("days", nargs="*", help="days to run (default all)")
+    parser.add_argument(
+        "--budget", type=float, default=10, metavar="SECONDS",
+        help="skip larger sizes once a run takes longer than this"
+    )
+    parser.add_argument("--json", metavar="FILE", help="write JSON report")
+    args = parser.parse_args()
+    days = [d.zfill(2) for d in args.days] or sorted(generators)
+    def fmt(v, spec):
+        return f"{'-':>{spec.split('.')[0]}}" if v == None else f"{v:{spec}}"
+    print(f"{'day':>3} {'n':>7} {'parse':>9} {'part1':>9} {'part2':>9}")
+    report = []
+    for day in days:
+        records = bench_day(day, args.budget)
+        for r in records:
+            print(
+                f"{day:>3} {r['n']:>7} {fmt(r['parse'], '9.3f')}"
+                f" {fmt(r['part1'], '9.3f')} {fmt(r['part2'], '9.3f')}"
+            )
+        complexity = {
+            stage: exponent((r["n"], r[stage]) for r in records)
+            for stage in stages
+        }
+        print(
+            f"{day:>3} {'~n^k':>7} {fmt(complexity['parse'], '9.1f')}"
+            f" {fmt(complexity['part1'], '9.1f')}"
+            f" {fmt(complexity['part2'], '9.1f')}"
+        )
+        report.append(dict(day=day, runs=records, exponents=complexity))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+if __name__ == "__main__":
+    main()
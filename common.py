@@ -1,5 +1,10 @@
+from array import array
 from collections import deque
+from functools import lru_cache
 from heapq import heappush, heappop
+from itertools import accumulate
+import mmap
+import re
 
 def each_do(fn, iterable):
     """Call a function on each item of an iterable.  Inspired by Ruby."""
@@ -22,6 +27,50 @@ def lfilter(*args):
     """Materialize a filter iterator as a list."""
     return list(filter(*args))
 
+def mapped(filename):
+    """Memory-map a file read-only and return the map.
+
+    The map is a bytes-like buffer that can be passed to lines, ints,
+    and fields below, which parse it in place rather than first
+    reading the whole file into a string and then splitting it.
+    """
+    with open(filename, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return b""
+
+def lines(buf):
+    """Yield the lines of a string or bytes-like buffer (e.g., one
+    returned by mapped), as strings without line terminators.
+    """
+    nl = "\n" if isinstance(buf, str) else b"\n"
+    i = 0
+    while i < len(buf):
+        j = buf.find(nl, i)
+        if j == -1:
+            j = len(buf)
+        yield buf[i:j] if isinstance(buf, str) else buf[i:j].decode()
+        i = j+1
+
+def ints(buf):
+    """Yield the (possibly negative) integers in a string or bytes-like
+    buffer, in order.
+    """
+    pattern = _int_str if isinstance(buf, str) else _int_bytes
+    for m in pattern.finditer(buf):
+        yield int(m[0])
+
+_int_str = re.compile(r"-?\d+")
+_int_bytes = re.compile(rb"-?\d+")
+
+def fields(buf):
+    """Yield the whitespace-separated fields of each line of a string or
+    bytes-like buffer, as lists of strings.
+    """
+    for l in lines(buf):
+        yield l.split()
+
 def bfs(start_node, visit_fn, accum_start=None):
     """Breadth-first search: call a function on each node visited.
 
@@ -85,7 +134,71 @@ def bfs_path(to_node, seen):
     path.reverse()
     return path
 
-def a_star(start_node, goal_node, visit_fn):
+def bfs_iter(start_node, neighbors_fn, seen=None):
+    """Breadth-first search as a generator: yield (node, dist) for each
+    node reachable from a start node, in order of increasing distance.
+
+    Nodes can be any hashable quantity.  neighbors_fn(node) should
+    return an iterable of the node's neighbors; it is called only when
+    the search proceeds past the node, so the caller can stop the
+    search at any time simply by no longer iterating.
+
+    If a dictionary `seen` is supplied, it is filled in with the nodes
+    visited so far, each mapped to the node that led to it (the start
+    node to None), so that bfs_path(node, seen) returns a shortest
+    path to the node just yielded.
+
+    Idiomatic usages:
+
+        for node, dist in bfs_iter(start_node, neighbors_fn, seen):
+            if node is the one desired:
+                path = bfs_path(node, seen)
+                break
+
+        num_nodes = sum(1 for _ in bfs_iter(start_node, neighbors_fn))
+    """
+    if seen == None:
+        seen = {}
+    seen[start_node] = None
+    frontier = [start_node]
+    dist = 0
+    while len(frontier) > 0:
+        next_frontier = []
+        for node in frontier:
+            yield node, dist
+            for n in neighbors_fn(node):
+                if n not in seen:
+                    seen[n] = node
+                    next_frontier.append(n)
+        frontier = next_frontier
+        dist += 1
+
+def bfs_labels(num_nodes, sources, neighbors_fn):
+    """Multi-source breadth-first search over nodes that are integers
+    in the range [0, num_nodes): label every node with the source it
+    is nearest to, in a single pass.
+
+    The return is an array("i") giving, for each node, the index in
+    `sources` of the source it was reached from, or -1 if it is not
+    reachable from any source.  A node equally near to several
+    sources is labeled with the first to reach it.
+    """
+    label = array("i", [-1])*num_nodes
+    frontier = list(sources)
+    for k, node in enumerate(frontier):
+        label[node] = k
+    while len(frontier) > 0:
+        next_frontier = []
+        for node in frontier:
+            k = label[node]
+            for n in neighbors_fn(node):
+                if label[n] == -1:
+                    label[n] = k
+                    next_frontier.append(n)
+        frontier = next_frontier
+    return label
+
+def a_star(start_node, goal_node, visit_fn, stats=None):
     """A* search: return a lowest cost path to a goal node.
 
     Nodes can be any hashable and equality-testable quantity.
@@ -103,6 +216,11 @@ def a_star(start_node, goal_node, visit_fn):
 
     The return is a list of tuples [(node, cumulative cost), ...].  If
     the goal node is not found, None is returned.
+
+    If a dictionary `stats` is supplied, search statistics are stored
+    in it: the number of nodes expanded ("expanded", counting repeat
+    expansions of nodes whose costs were revised), and the peak size
+    of the frontier ("peak_frontier").
     """
     def serial_num(num=[0]):
         # In the heap it may happen that two nodes have the same
@@ -113,23 +231,30 @@ def a_star(start_node, goal_node, visit_fn):
     frontier = [(0, serial_num(), start_node)]
     costs = {start_node: 0}  # lowest costs seen so far; subject to revision
     previous = {start_node: (None, 0)}
-    while len(frontier) > 0:
-        node = heappop(frontier)[2]
-        if node == goal_node:
-            path = []
-            p = node
-            while p != None:
-                path.append((p, previous[p][1]))
-                p = previous[p][0]
-            path.reverse()
-            return path
-        for n, c, h in visit_fn(node):
-            g = costs[node] + c
-            if n not in costs or g < costs[n]:
-                costs[n] = g
-                previous[n] = (node, g)
-                heappush(frontier, (g+h, serial_num(), n))
-    return None
+    expanded = peak_frontier = 0
+    try:
+        while len(frontier) > 0:
+            peak_frontier = max(peak_frontier, len(frontier))
+            node = heappop(frontier)[2]
+            expanded += 1
+            if node == goal_node:
+                path = []
+                p = node
+                while p != None:
+                    path.append((p, previous[p][1]))
+                    p = previous[p][0]
+                path.reverse()
+                return path
+            for n, c, h in visit_fn(node):
+                g = costs[node] + c
+                if n not in costs or g < costs[n]:
+                    costs[n] = g
+                    previous[n] = (node, g)
+                    heappush(frontier, (g+h, serial_num(), n))
+        return None
+    finally:
+        if stats != None:
+            stats.update(expanded=expanded, peak_frontier=peak_frontier)
 
 def neighbors4(*args):
     """Return a grid cell's 4 (up/down/left/right) neighbors.
@@ -178,3 +303,122 @@ def _neighbors(*args):
         for dx, dy in deltas
         if xlim == None or (0 <= x+dx < xlim and 0 <= y+dy < ylim)
     ]
+
+@lru_cache(maxsize=None)
+def neighbor_table(num_rows, num_cols, connectivity=4):
+    """Return a table of the neighbors of every cell in a grid, by flat
+    index.  Connectivity is 4 (up/down/left/right) or 8 (also
+    diagonal).
+
+    Cell (r, c) has flat index r*num_cols+c.  The return is a pair of
+    arrays (start, index) in compressed sparse row form: the flat
+    indexes of cell i's neighbors are index[start[i]:start[i+1]].
+    Iterating over these avoids the per-call argument parsing and list
+    and tuple building of neighbors4/neighbors8, and tables are built
+    once per grid shape and cached.
+    """
+    if connectivity == 4:
+        deltas = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    else:
+        deltas = [(dr, dc) for dr in [-1, 0, 1] for dc in [-1, 0, 1]]
+        deltas.remove((0, 0))
+    # Rows of the same kind (top, bottom, or in between) have the same
+    # neighbor offsets relative to the row's first cell, so we compute
+    # those once per kind and add each row's base index.
+    patterns = {}
+    start = array("i", [0])
+    index = array("i")
+    for r in range(num_rows):
+        kind = (r == 0, r == num_rows-1)
+        if kind not in patterns:
+            offsets = []
+            counts = []
+            for c in range(num_cols):
+                l = [
+                    dr*num_cols+c+dc
+                    for dr, dc in deltas
+                    if 0 <= r+dr < num_rows and 0 <= c+dc < num_cols
+                ]
+                offsets.extend(l)
+                counts.append(len(l))
+            patterns[kind] = (offsets, list(accumulate(counts)))
+        offsets, ends = patterns[kind]
+        n = len(index)
+        index.extend(map((r*num_cols).__add__, offsets))
+        start.extend(map(n.__add__, ends))
+    return start, index
+
+class Grid:
+    """A two-dimensional grid of small (0-255) integers, stored row by
+    row in a single bytearray: cell (r, c) is at flat index
+    r*num_cols+c of `cells`.  This costs one byte per cell, versus a
+    list element plus (for values outside the small int cache) an int
+    object per cell in a list of lists.
+
+    grid[r, c] is bounds-checked; grid.wrap(r, c) wraps around the
+    edges.  Hot loops should index `cells` directly, using
+    neighbor_table(num_rows, num_cols) for neighbors.
+    """
+
+    __slots__ = ("num_rows", "num_cols", "cells")
+
+    def __init__(self, num_rows, num_cols, cells=None):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        if cells == None:
+            cells = bytearray(num_rows*num_cols)
+        assert len(cells) == num_rows*num_cols
+        self.cells = cells
+
+    @classmethod
+    def parse(cls, text, table=None):
+        """Parse a grid from a string or bytes-like buffer, one row per
+        line.  Cell values are the characters' byte values, translated
+        through `table` (see bytes.maketrans) if given; e.g., DIGITS
+        maps "0"-"9" to 0-9.
+        """
+        if isinstance(text, str):
+            text = text.encode()
+        rows = bytes(text).splitlines()
+        num_cols = len(rows[0])
+        assert all(len(row) == num_cols for row in rows)
+        cells = bytearray().join(rows)
+        if table != None:
+            cells = cells.translate(table)
+        return cls(len(rows), num_cols, cells)
+
+    def copy(self):
+        return Grid(self.num_rows, self.num_cols, self.cells[:])
+
+    def index(self, r, c):
+        """Return the flat index of cell (r, c), bounds-checked."""
+        if not (0 <= r < self.num_rows and 0 <= c < self.num_cols):
+            raise IndexError(f"cell {(r, c)} outside grid")
+        return r*self.num_cols+c
+
+    def __getitem__(self, rc):
+        return self.cells[self.index(*rc)]
+
+    def __setitem__(self, rc, v):
+        self.cells[self.index(*rc)] = v
+
+    def get(self, r, c, default=None):
+        """Return cell (r, c), or `default` if outside the grid."""
+        if 0 <= r < self.num_rows and 0 <= c < self.num_cols:
+            return self.cells[r*self.num_cols+c]
+        else:
+            return default
+
+    def wrap(self, r, c):
+        """Return cell (r, c), wrapping around the grid's edges."""
+        return self.cells[(r%self.num_rows)*self.num_cols + c%self.num_cols]
+
+    def row(self, r):
+        """Return a writable view of row r."""
+        return memoryview(self.cells)[r*self.num_cols:(r+1)*self.num_cols]
+
+    def col(self, c):
+        """Return a writable (strided) view of column c."""
+        return memoryview(self.cells)[c::self.num_cols]
+
+DIGITS = bytes.maketrans(b"0123456789", bytes(range(10)))
@@ -0,0 +1,188 @@
+"""Run the daily solutions and report answers, timings, and memory use.
+
+Usage:
+
+    python run.py [-j N] [--memory] [--json FILE] [--csv FILE] [DAY ...]
+
+Each day is run in a fresh process so that its timings and peak
+memory are not polluted by other days.  With -j, up to N days are run
+concurrently in a process pool; the days share no state, so a full
+run then takes about as long as the slowest day (though contention
+for cores and caches may inflate individual timings).
+
+Each day's input is parsed once and then fed to each part.  For each
+stage (parse, part 1, part 2) we record the answer, wall time, CPU
+time, and the process's resident set size high-water mark so far
+(which includes earlier stages and can only go up).
+
+With --memory, each day is additionally run in a second fresh process
+under tracemalloc, and each stage's own peak of traced allocations is
+recorded.  Tracing slows the stages severalfold, so the timings come
+from the untraced run.
+
+The report can be written as JSON and/or CSV to track regressions
+across commits.
+"""
+
+from multiprocessing import Pool
+from time import perf_counter, process_time
+import argparse
+import csv
+import importlib.util
+import json
+import os
+import re
+import resource
+import tracemalloc
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+fields = ["day", "part", "answer", "wall", "cpu", "peak_kb", "rss_hwm_kb"]
+
+def find_days():
+    """Return the days (as "01", "02", ...) having solution scripts."""
+    return sorted(
+        m[1] for m in map(re.compile(r"(\d\d)\.py$").match, os.listdir(here))
+        if m
+    )
+
+def load_day(day):
+    """Import and return a day's solution module.
+
+    The module is expected to provide parse(text), part1(parsed), and
+    part2(parsed), and may provide load(filename) as a more efficient
+    alternative to parsing the file's text.  Typically load is
+    parse(common.mapped(filename)), for a day whose parse also accepts
+    a bytes-like buffer and reads it with common's lines, ints, or
+    fields (or Grid.parse).
+    """
+    filename = os.path.join(here, f"{day}.py")
+    spec = importlib.util.spec_from_file_location(f"day{day}", filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def run_day(day, trace=False):
+    """Run a day's solution on its input and return a list of
+    per-stage records (parse, part 1, part 2).
+
+    If `trace` is true, each stage's peak traced memory is recorded as
+    peak_kb (None otherwise), but its timings are inflated by tracing.
+    Intended to be called in a fresh process.
+    """
+    module = load_day(day)
+    filename = os.path.join(here, f"{day}.in")
+    records = []
+    if trace:
+        tracemalloc.start()
+    def timed(part, fn, *args):
+        if trace:
+            tracemalloc.reset_peak()
+        wall, cpu = perf_counter(), process_time()
+        result = fn(*args)
+        wall, cpu = perf_counter()-wall, process_time()-cpu
+        records.append(
+            dict(
+                day=day,
+                part=part,
+                answer="" if part == "parse" else str(result),
+                wall=wall,
+                cpu=cpu,
+                peak_kb=tracemalloc.get_traced_memory()[1]//1024
+                    if trace else None,
+                rss_hwm_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            )
+        )
+        return result
+    if hasattr(module, "load"):
+        parsed = timed("parse", module.load, filename)
+    else:
+        with open(filename) as f:
+            parsed = timed("parse", module.parse, f.read())
+    timed(1, module.part1, parsed)
+    timed(2, module.part2, parsed)
+    return records
+
+def run(days, jobs=1, memory=False):
+    """Run days in a pool of `jobs` processes, each day in a fresh
+    process.  Records are returned in the order of `days`.  If `memory`
+    is true, each day is run again under tracing to fill in peak_kb.
+    """
+    with Pool(jobs, maxtasksperchild=1) as pool:
+        results = [pool.apply_async(run_day, (day,)) for day in days]
+        traced = [
+            pool.apply_async(run_day, (day, True)) for day in days if memory
+        ]
+        records = [r for a in results for r in a.get()]
+        for r, t in zip(records, (t for a in traced for t in a.get())):
+            r["peak_kb"] = t["peak_kb"]
+        return records
+
+def print_table(records):
+    print(
+        f"{'day':>3} {'part':>5} {'wall':>9} {'cpu':>9} {'peak':>9}"
+        f" {'rss hwm':>9}  answer"
+    )
+    for r in records:
+        answer = r["answer"].split("\n")
+        peak = "-" if r["peak_kb"] == None else f"{r['peak_kb']}KB"
+        print(
+            f"{r['day']:>3} {r['part']:>5} {r['wall']:9.3f} {r['cpu']:9.3f}"
+            f" {peak:>9} {r['rss_hwm_kb']:>7}KB  {answer[0]}"
+        )
+        for l in answer[1:]:
+            print(" "*54 + l)
+
+def print_summary(records, elapsed):
+    print()
+    print(f"{'day':>3} {'wall':>9} {'cpu':>9}")
+    days = {}
+    for r in records:
+        wall, cpu = days.get(r["day"], (0, 0))
+        days[r["day"]] = (wall+r["wall"], cpu+r["cpu"])
+    for day, (wall, cpu) in days.items():
+        print(f"{day:>3} {wall:9.3f} {cpu:9.3f}")
+    print(
+        f"sum {sum(w for w, _ in days.values()):9.3f}"
+        f" {sum(c for _, c in days.values()):9.3f}"
+    )
+    print(f"elapsed {elapsed:.3f}")
+
+def write_json(records, filename):
+    with open(filename, "w") as f:
+        json.dump(records, f, indent=2)
+        f.write("\n")
+
+def write_csv(records, filename):
+    with open(filename, "w", newline="") as f:
+        w = csv.DictWriter(f, fields)
+        w.writeheader()
+        w.writerows(records)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("days", nargs="*", help="days to run (default all)")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, metavar="N",
+        help="number of days to run concurrently (0 = number of CPUs)"
+    )
+    parser.add_argument(
+        "--memory", action="store_true",
+        help="also measure each stage's peak memory in a traced run"
+    )
+    parser.add_argument("--json", metavar="FILE", help="write JSON report")
+    parser.add_argument("--csv", metavar="FILE", help="write CSV report")
+    args = parser.parse_args()
+    days = [d.zfill(2) for d in args.days] or find_days()
+    start = perf_counter()
+    records = run(days, args.jobs or os.cpu_count(), args.memory)
+    elapsed = perf_counter()-start
+    print_table(records)
+    print_summary(records, elapsed)
+    if args.json:
+        write_json(records, args.json)
+    if args.csv:
+        write_csv(records, args.csv)
+
+if __name__ == "__main__":
+    main()